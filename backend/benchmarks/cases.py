@@ -0,0 +1,170 @@
+"""
+Benchmark cases. Each factory gets the parsed CLI arguments and returns a
+setup function; setup runs untimed before every measurement and returns the
+callable that is timed (which may return extra info for the report).
+"""
+import os
+import json
+import shutil
+import asyncio
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from src.config import settings
+from src.models import DialogueScript
+from src.audio.assembler import AudioAssembler
+from src.audio.text_chunker import text_chunker, chunk_length_stats
+from src.audio.task_manager import TaskManager
+from src.audio.task_store import InMemoryTaskStore, SQLiteTaskStore
+from benchmarks.fakes import SAMPLE_RATE, FakeQwenHandler, fake_wav
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SEED_SCRIPT = os.path.join(BACKEND_DIR, "generated_script.json")
+
+
+class Skip(Exception):
+    """Raised by a factory when its benchmark cannot run here."""
+
+
+def load_script(copies: int) -> DialogueScript:
+    """generated_script.json with its lines repeated ``copies`` times."""
+    with open(SEED_SCRIPT, encoding="utf-8") as f:
+        script = DialogueScript.model_validate(json.load(f)["script"])
+    return DialogueScript(title=script.title, lines=script.lines * copies, created_at=datetime.now())
+
+
+def require_ffmpeg():
+    from pydub import AudioSegment
+
+    if shutil.which(AudioSegment.converter) is None:
+        raise Skip("ffmpeg not found")
+
+
+def podcastfy_client():
+    from src.podcastfy_client import PodcastfyClient
+
+    return PodcastfyClient()
+
+
+def line_wavs(script: DialogueScript) -> List[list]:
+    """Fake audio for every chunk of every line, as the engine would return it."""
+    return [[fake_wav(chunk) for chunk in text_chunker.split(line.text)] for line in script.lines]
+
+
+def bench_chunker(args) -> Callable:
+    texts = [line.text for line in load_script(args.scale).lines]
+
+    def run():
+        chunks = []
+        for text in texts:
+            chunks.extend(text_chunker.split(text))
+        return chunk_length_stats(chunks)
+    return lambda: run
+
+
+def bench_script_to_transcript(args) -> Callable:
+    script = load_script(args.scale)
+    client = podcastfy_client()
+    return lambda: lambda: {"chars": len(client._script_to_transcript(script))}
+
+
+def bench_parse_transcript(args) -> Callable:
+    client = podcastfy_client()
+    path = os.path.abspath("transcript_bench.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(client._script_to_transcript(load_script(args.scale)))
+    return lambda: lambda: {"lines": len(client._parse_transcript(path).lines)}
+
+
+def bench_assembly(args) -> Callable:
+    wavs = line_wavs(load_script(args.audio_scale))
+
+    def run():
+        assembler = AudioAssembler(SAMPLE_RATE)
+        for chunks in wavs:
+            assembler.add_line(chunks)
+        assembler.build()
+        return {"audio_seconds": assembler.duration_seconds}
+    return lambda: run
+
+
+def bench_encode(args) -> Callable:
+    require_ffmpeg()
+    from src.audio.streaming import MP3FileEncoder
+
+    wavs = line_wavs(load_script(args.audio_scale))
+    path = os.path.abspath("encode_bench.mp3")
+
+    def run():
+        assembler = AudioAssembler(SAMPLE_RATE, sink=MP3FileEncoder(path, SAMPLE_RATE, settings.MP3_BITRATE))
+        for chunks in wavs:
+            assembler.add_line(chunks)
+        assembler.sink.close()
+        return {"audio_seconds": assembler.duration_seconds, "mp3_bytes": os.path.getsize(path)}
+    return lambda: run
+
+
+def bench_generate_qwen(args) -> Callable:
+    """generate_with_engine on the qwen engine end to end, with a fake handler."""
+    require_ffmpeg()
+    import src.audio.tts_engines as tts_engines
+    from src.api_router import generate_with_engine
+
+    handler = FakeQwenHandler(settings.QWEN_BATCH_SIZE)
+    tts_engines.get_qwen_handler = lambda: handler
+    engine = tts_engines.get_engine("qwen")
+    script = load_script(args.audio_scale)
+
+    def run():
+        path = asyncio.run(generate_with_engine(script, engine, background_upload=False))
+        size = os.path.getsize(path)
+        os.remove(path)
+        return {"lines": len(script.lines), "mp3_bytes": size}
+    return lambda: run
+
+
+def _task_lifecycle(manager: TaskManager, count: int) -> dict:
+    ids = [manager.create_task() for _ in range(count)]
+    for task_id in ids:
+        task = manager.get_task(task_id)
+        task.set_status("running")
+        for step in range(1, 5):
+            task.update_progress(step / 4)
+        task.set_status("completed")
+    listed = len(manager.list_tasks(status="completed", limit=100))
+    for task_id in ids[::10]:
+        manager.cancel_task(task_id)
+        manager.remove_task(task_id)
+    return {"tasks": count, "listed": listed}
+
+
+def bench_tasks_memory(args) -> Callable:
+    def setup():
+        manager = TaskManager(InMemoryTaskStore(ttl_seconds=3600, max_tasks=args.tasks * 2))
+        return lambda: _task_lifecycle(manager, args.tasks)
+    return setup
+
+
+def bench_tasks_sqlite(args) -> Callable:
+    count = max(1, args.tasks // 10)
+
+    def setup():
+        path = os.path.abspath("tasks_bench.db")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        manager = TaskManager(SQLiteTaskStore(path, ttl_seconds=3600, max_tasks=count * 2))
+        return lambda: _task_lifecycle(manager, count)
+    return setup
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    "chunker.split": bench_chunker,
+    "transcript.script_to_transcript": bench_script_to_transcript,
+    "transcript.parse": bench_parse_transcript,
+    "audio.assembly": bench_assembly,
+    "audio.encode_mp3": bench_encode,
+    "generate.qwen_fake": bench_generate_qwen,
+    "tasks.memory": bench_tasks_memory,
+    "tasks.sqlite": bench_tasks_sqlite,
+}
@@ -0,0 +1,54 @@
+import asyncio
+import threading
+import numpy as np
+from typing import Callable, List, Optional, Tuple
+
+from src.audio.generation import GenerationCancelled
+
+SAMPLE_RATE = 24000
+# Roughly the speaking rate of the Korean hosts
+SECONDS_PER_CHAR = 0.07
+
+
+def fake_wav(text: str, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Deterministic stand-in for synthesized speech: a tone as long as the text would take to read."""
+    samples = max(1, int(len(text) * SECONDS_PER_CHAR * sample_rate))
+    frequency = 180 + (sum(map(ord, text)) % 120)
+    t = np.arange(samples, dtype=np.float32) / sample_rate
+    return (0.3 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+class FakeQwenHandler:
+    """
+    Drop-in for QwenTTSHandler that needs no model.
+
+    Mirrors the batch interface the qwen engine calls (progress per batch,
+    cancellation between batches) and returns ``fake_wav`` audio, so the
+    benchmarks measure everything around inference.
+    """
+
+    model_id = "fake-qwen"
+
+    def __init__(self, batch_size: int = 8):
+        self.batch_size = batch_size
+
+    async def generate(self, text: str, ref_audio_path: str) -> Tuple[np.ndarray, int]:
+        return fake_wav(text), SAMPLE_RATE
+
+    async def generate_batch(
+        self,
+        items: List[Tuple[str, str]],
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Tuple[List[np.ndarray], int]:
+        return await asyncio.to_thread(self._generate_batch_sync, items, progress_callback, cancel_event)
+
+    def _generate_batch_sync(self, items, progress_callback=None, cancel_event=None):
+        wavs = []
+        for start in range(0, len(items), self.batch_size):
+            if cancel_event is not None and cancel_event.is_set():
+                raise GenerationCancelled("Generation cancelled")
+            wavs.extend(fake_wav(text) for text, _ in items[start:start + self.batch_size])
+            if progress_callback:
+                progress_callback(len(wavs), len(items))
+        return wavs, SAMPLE_RATE
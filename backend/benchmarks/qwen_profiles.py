@@ -0,0 +1,233 @@
+"""
+Quality/speed comparison of Qwen inference profiles on a fixed text set.
+
+Run from backend/ on the machine you are tuning for (needs the model and
+data/voices/host_a.wav):
+
+    python -m benchmarks.qwen_profiles
+    python -m benchmarks.qwen_profiles -p baseline,int8 --threads 8 --save-audio /tmp/qwen
+
+Each profile runs in its own process, since thread counts, quantization and
+compilation are process-wide, and is selected through the QWEN_* settings.
+
+Speed: model load time, real-time factor (synthesis time / audio duration)
+per text and for all texts in one batched call, peak RSS.
+Quality proxies against the first profile: duration ratio (catches runaway
+or truncated generation), RMS level, clipping and silence ratios, and the
+distance between long-term average spectra in dB (voice timbre drift).
+Sampling is seeded, but listen to the saved audio before switching
+production to a quantized profile.
+"""
+import os
+import sys
+import json
+import time
+import wave
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List
+
+import numpy as np
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+TEXTS = [
+    "안녕하세요! 일일 팟캐스트 심층 분석 시간입니다.",
+    "오늘은 인공지능 시대의 리더십과 열 가지 기술 트렌드를 살펴보겠습니다.",
+    "네, 맞아요.",
+    "이번 분기 매출은 3.5% 늘어난 1,200억 원을 기록했다고 합니다.",
+    "GitHub Copilot이나 ChatGPT 같은 도구를 쓰는 사람과, AI로 팀을 이끄는 사람은 어떻게 다를까요?",
+    "결국 중요한 건 도구가 아니라 질문을 잘 던지는 능력이라는 거죠.",
+    "그렇다면 개발자들은 앞으로 어떤 역량을 키워야 할까요? 저는 문제를 정의하는 힘이라고 생각합니다.",
+    "오늘 이야기는 여기까지입니다. 다음 주에도 흥미로운 소식으로 찾아뵙겠습니다. 감사합니다!",
+]
+
+# Settings shared by every profile; each profile overrides some of them
+BASE_ENV = {
+    "QWEN_INFERENCE_MODE": "true",
+    "QWEN_DTYPE": "float32",
+    "QWEN_QUANTIZATION": "none",
+    "QWEN_COMPILE": "false",
+    "TTS_CACHE_ENABLED": "false",
+}
+
+PROFILES: Dict[str, Dict[str, str]] = {
+    "baseline": {"QWEN_INFERENCE_MODE": "false"},
+    "inference_mode": {},
+    "bf16": {"QWEN_DTYPE": "bfloat16"},
+    "int8": {"QWEN_QUANTIZATION": "int8"},
+    "compile": {"QWEN_COMPILE": "true"},
+    "int8_compile": {"QWEN_QUANTIZATION": "int8", "QWEN_COMPILE": "true"},
+}
+
+SILENCE_DBFS = -40.0
+
+
+def audio_features(wav: np.ndarray, sample_rate: int) -> dict:
+    """Level, clipping, silence and long-term average spectrum of one clip."""
+    wav = np.asarray(wav, dtype=np.float32).reshape(-1)
+    frame = 1024
+    hop = 512
+    frames = np.lib.stride_tricks.sliding_window_view(wav, frame)[::hop] if len(wav) >= frame else wav[None, :frame]
+    if frames.shape[1] < frame:
+        frames = np.pad(frames, ((0, 0), (0, frame - frames.shape[1])))
+    frame_rms = np.sqrt(np.mean(frames ** 2, axis=1) + 1e-12)
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(frame), axis=1)).mean(axis=0)
+    # Speech band only; above 8 kHz is mostly noise for these voices
+    band = np.fft.rfftfreq(frame, 1 / sample_rate) <= 8000
+    return {
+        "duration_s": len(wav) / sample_rate,
+        "rms_dbfs": float(20 * np.log10(np.sqrt(np.mean(wav ** 2)) + 1e-12)),
+        "clipping_ratio": float(np.mean(np.abs(wav) >= 0.999)),
+        "silence_ratio": float(np.mean(20 * np.log10(frame_rms) < SILENCE_DBFS)),
+        "ltas_db": (20 * np.log10(spectrum[band] + 1e-9)).tolist(),
+    }
+
+
+def save_wav(path: str, wav: np.ndarray, sample_rate: int):
+    from src.audio.assembler import pcm_to_int16
+
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm_to_int16(wav).tobytes())
+
+
+def run_worker(name: str, output: str, save_audio: str):
+    """Measure the profile configured in this process's environment."""
+    import resource
+    import torch
+
+    sys.path.insert(0, BACKEND_DIR)
+    from src.audio.qwen_handler import QwenTTSHandler
+    from src.audio.tts_engines import get_reference_audio
+
+    ref_path = get_reference_audio("Host A")
+    if not os.path.exists(ref_path):
+        raise SystemExit(f"Reference voice not found: {ref_path}")
+
+    start = time.perf_counter()
+    handler = QwenTTSHandler()
+    load_s = time.perf_counter() - start
+
+    # First call pays for speaker embedding extraction and compilation
+    start = time.perf_counter()
+    handler._generate_batch_sync([(TEXTS[0], ref_path)])
+    warmup_s = time.perf_counter() - start
+
+    texts = []
+    for i, text in enumerate(TEXTS):
+        torch.manual_seed(0)
+        start = time.perf_counter()
+        (wav,), sample_rate = handler._generate_batch_sync([(text, ref_path)])
+        elapsed = time.perf_counter() - start
+        features = audio_features(wav, sample_rate)
+        features.update(text=text, seconds=elapsed, rtf=elapsed / max(features["duration_s"], 1e-6))
+        texts.append(features)
+        if save_audio:
+            os.makedirs(os.path.join(save_audio, name), exist_ok=True)
+            save_wav(os.path.join(save_audio, name, f"{i:02d}.wav"), wav, sample_rate)
+
+    torch.manual_seed(0)
+    start = time.perf_counter()
+    wavs, sample_rate = handler._generate_batch_sync([(text, ref_path) for text in TEXTS])
+    batch_s = time.perf_counter() - start
+    batch_audio_s = sum(len(w) for w in wavs) / sample_rate
+
+    result = {
+        "profile": name,
+        "load_s": load_s,
+        "warmup_s": warmup_s,
+        "threads": torch.get_num_threads(),
+        "interop_threads": torch.get_num_interop_threads(),
+        "mean_rtf": float(np.mean([t["rtf"] for t in texts])),
+        "batch_s": batch_s,
+        "batch_rtf": batch_s / batch_audio_s,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "texts": texts,
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False)
+
+
+def compare(reference: dict, result: dict) -> dict:
+    """Quality deltas of ``result`` relative to the reference profile, averaged over texts."""
+    pairs = list(zip(reference["texts"], result["texts"]))
+    return {
+        "speedup": reference["mean_rtf"] / result["mean_rtf"],
+        "batch_speedup": reference["batch_rtf"] / result["batch_rtf"],
+        "duration_ratio": float(np.mean([b["duration_s"] / a["duration_s"] for a, b in pairs])),
+        "rms_delta_db": float(np.mean([b["rms_dbfs"] - a["rms_dbfs"] for a, b in pairs])),
+        "ltas_distance_db": float(np.mean([
+            np.sqrt(np.mean((np.array(b["ltas_db"]) - np.array(a["ltas_db"])) ** 2)) for a, b in pairs
+        ])),
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-p", "--profiles", default=",".join(PROFILES),
+                        help=f"Comma-separated profiles, the first is the reference ({', '.join(PROFILES)})")
+    parser.add_argument("--threads", type=int, default=0, help="QWEN_NUM_THREADS for every profile")
+    parser.add_argument("--interop-threads", type=int, default=0, help="QWEN_NUM_INTEROP_THREADS for every profile")
+    parser.add_argument("--save-audio", default="", help="Directory for the generated WAVs, one folder per profile")
+    parser.add_argument("--output", default=os.path.join(BACKEND_DIR, "benchmarks", "qwen_profiles.json"))
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(args.worker, args.output, args.save_audio)
+        return 0
+
+    names = [n.strip() for n in args.profiles.split(",") if n.strip()]
+    unknown = [n for n in names if n not in PROFILES]
+    if unknown:
+        parser.error(f"Unknown profiles: {', '.join(unknown)}")
+
+    results = []
+    for name in names:
+        env = dict(os.environ, **BASE_ENV, **PROFILES[name])
+        env["QWEN_NUM_THREADS"] = str(args.threads)
+        env["QWEN_NUM_INTEROP_THREADS"] = str(args.interop_threads)
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+            output = tmp.name
+        print(f"[{name}] running...")
+        try:
+            command = [sys.executable, "-m", "benchmarks.qwen_profiles", "--worker", name, "--output", output]
+            if args.save_audio:
+                command += ["--save-audio", os.path.abspath(args.save_audio)]
+            completed = subprocess.run(command, cwd=BACKEND_DIR, env=env)
+            if completed.returncode != 0:
+                print(f"[{name}] failed with exit code {completed.returncode}")
+                continue
+            with open(output, encoding="utf-8") as f:
+                results.append(json.load(f))
+        finally:
+            os.remove(output)
+
+    if not results:
+        return 1
+
+    reference = results[0]
+    print(f"\nReference: {reference['profile']} ({reference['threads']} threads)")
+    print(f"{'profile':<16}{'load s':>8}{'RTF':>8}{'batch RTF':>11}{'speedup':>9}{'dur ratio':>11}{'LTAS dB':>9}{'RSS MB':>9}")
+    for result in results:
+        result["vs_reference"] = compare(reference, result)
+        delta = result["vs_reference"]
+        print(
+            f"{result['profile']:<16}{result['load_s']:>8.1f}{result['mean_rtf']:>8.3f}{result['batch_rtf']:>11.3f}"
+            f"{delta['speedup']:>8.2f}x{delta['duration_ratio']:>11.2f}{delta['ltas_distance_db']:>9.2f}"
+            f"{result['peak_rss_mb']:>9.0f}"
+        )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"reference": reference["profile"], "results": results}, f, indent=2, ensure_ascii=False)
+    print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
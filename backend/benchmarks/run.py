@@ -0,0 +1,178 @@
+"""
+Offline microbenchmarks for the backend hot paths.
+
+Run from backend/:
+
+    python -m benchmarks.run                        # print results, write benchmarks/results.json
+    python -m benchmarks.run --save-baseline        # record benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --tolerance 0.25
+
+With a baseline, exits with status 1 when any benchmark's median is more
+than ``tolerance`` slower than its baseline, or when a benchmark could not
+be compared because it was skipped on either side (``--allow-unchecked``
+only warns). No network, API keys, model
+or Supabase are used: TTS goes through a deterministic fake Qwen handler
+and all files are written to a temporary directory. Benchmarks that need
+ffmpeg are skipped when it is not installed.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BENCH_DIR = os.path.join(BACKEND_DIR, "benchmarks")
+
+# Relative CLI paths refer to where the command was run
+INVOCATION_DIR = os.getcwd()
+# Isolate settings and data before anything imports src.config
+WORK_DIR = tempfile.mkdtemp(prefix="podcast-bench-")
+os.environ.update({
+    "SUPABASE_URL": "",
+    "SUPABASE_KEY": "",
+    "TTS_CACHE_ENABLED": "false",
+    "SCRIPT_CACHE_ENABLED": "false",
+    "TASK_STORE": "memory",
+    "EPISODE_INDEX_PATH": os.path.join(WORK_DIR, "episodes.db"),
+})
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(WORK_DIR)
+
+from benchmarks import cases  # noqa: E402
+
+BENCHMARKS: Dict[str, Callable[[argparse.Namespace], Callable[[], Callable[[], Optional[dict]]]]] = cases.BENCHMARKS
+
+
+def measure(setup: Callable[[], Callable[[], Optional[dict]]], repeat: int, warmup: int) -> dict:
+    """Time ``setup()``'s returned callable; ``setup`` runs once per measurement, untimed."""
+    timings = []
+    info: Optional[dict] = None
+    for i in range(warmup + repeat):
+        fn = setup()
+        start = time.perf_counter()
+        info = fn()
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            timings.append(elapsed)
+    result = {
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "mean_s": statistics.fmean(timings),
+        "stdev_s": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "repeat": repeat,
+    }
+    if info:
+        result["info"] = info
+    return result
+
+
+def compare(
+    results: Dict[str, dict],
+    baseline: Dict[str, dict],
+    tolerance: float,
+    min_delta: float
+) -> Tuple[List[str], List[str]]:
+    """
+    Print median changes against the baseline; returns the names that regressed
+    and those that could not be compared (skipped on either side, or missing
+    from the baseline). Slowdowns under ``min_delta`` seconds are treated as noise.
+    """
+    regressions, unchecked = [], []
+    print(f"\n{'benchmark':<36}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if "median_s" not in result or not base or "median_s" not in base:
+            reason = result.get("skipped") or (base or {}).get("skipped", "not in baseline")
+            unchecked.append(name)
+            print(f"{name:<36}{'UNCHECKED':>34}  ({reason})")
+            continue
+        change = result["median_s"] / base["median_s"] - 1
+        result["baseline_median_s"] = base["median_s"]
+        result["change"] = change
+        flag = ""
+        if change > tolerance and result["median_s"] - base["median_s"] > min_delta:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<36}{base['median_s'] * 1000:>10.2f}ms{result['median_s'] * 1000:>10.2f}ms{change:>+9.1%}{flag}")
+    return regressions, unchecked
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=os.path.join(BENCH_DIR, "results.json"))
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Also write results to benchmarks/baseline.json")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--allow-unchecked", action="store_true", help="Only warn about benchmarks skipped on either side")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore slowdowns smaller than this")
+    parser.add_argument("--scale", type=int, default=20, help="Copies of generated_script.json in the large script")
+    parser.add_argument("--audio-scale", type=int, default=2, help="Copies of generated_script.json for audio benchmarks")
+    parser.add_argument("--tasks", type=int, default=10000, help="Tasks in the TaskManager benchmarks (1/10 for SQLite)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("-k", "--filter", default="", help="Only run benchmarks whose name contains this")
+    args = parser.parse_args(argv)
+    args.output = os.path.join(INVOCATION_DIR, args.output)
+    if args.baseline:
+        args.baseline = os.path.join(INVOCATION_DIR, args.baseline)
+
+    results: Dict[str, dict] = {}
+    try:
+        for name, factory in BENCHMARKS.items():
+            if args.filter not in name:
+                continue
+            try:
+                setup = factory(args)
+            except cases.Skip as e:
+                print(f"{name:<36} skipped: {e}")
+                results[name] = {"skipped": str(e)}
+                continue
+            results[name] = measure(setup, args.repeat, args.warmup)
+            print(f"{name:<36}{results[name]['median_s'] * 1000:>10.2f}ms  (min {results[name]['min_s'] * 1000:.2f}ms)")
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    regressions, unchecked = [], []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions, unchecked = compare(
+                results, json.load(f)["results"], args.tolerance, args.min_delta_ms / 1000
+            )
+
+    report = {
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": args.scale,
+        "audio_scale": args.audio_scale,
+        "tasks": args.tasks,
+        "results": results,
+        "regressions": regressions,
+        "unchecked": unchecked,
+    }
+    outputs = [args.output] + ([os.path.join(BENCH_DIR, "baseline.json")] if args.save_baseline else [])
+    for path in outputs:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Wrote {path}")
+
+    status = 0
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        status = 1
+    if unchecked:
+        print(f"{len(unchecked)} benchmark(s) not compared against the baseline: {', '.join(unchecked)}")
+        if not args.allow_unchecked:
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
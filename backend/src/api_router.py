@@ -1,161 +1,154 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import List, Optional, Callable
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Literal, Optional, Callable, Tuple
 from src.models import (
     ProcessingRequest, PodcastEpisode, PodcastMetadata, ScriptResponse, 
     AudioFromScriptRequest, AudioResponse, DialogueScript,
-    AsyncTaskResponse, TaskStatusResponse
+    AsyncTaskResponse, TaskStatusResponse, StreamResponse, DialogueLine,
+    EpisodeBulkDeleteRequest, EpisodeBulkDeleteResponse, EpisodeListResponse
 )
 from src.podcastfy_client import PodcastfyClient
 from src.audio.task_manager import task_manager
+from src.audio.job_queue import job_scheduler, QueueFullError
+from src.audio.generation import (
+    GenerationCancelled, synthesize_episode, synthesize_streaming, iter_engine_lines, run_tts_job
+)
 from src.config import settings
 import os
-import uuid
 from datetime import datetime
 import asyncio
-from pydub import AudioSegment
+import threading
 
 from src.storage_client import storage_client
-from src.audio.qwen_handler import QwenTTSHandler
+from src.audio.tts_engines import TTSEngine, get_engine
+from src.audio.chunk_cache import tts_chunk_cache
+from src.audio.text_chunker import text_chunker
+from src.content.source_cache import source_cache
+from src.content.ingestion import source_ingestor
+from src.script_cache import script_cache
+from src.script_stream import title_from_lines
+from src.episode_cleanup import delete_episodes, episode_retention
+from src.episode_index import episode_index
+from src.audio.streaming import HLSSegmentWriter, encode_mp3, stream_mp3, PLAYLIST_NAME
 
 router = APIRouter()
 
 # Initialize Podcastfy client
 podcastfy_client = PodcastfyClient()
 
-def get_reference_audio(speaker_name: str) -> str:
-    """Get the reference audio path for a given speaker."""
-    base_dir = os.path.join(os.path.dirname(__file__), "../data/voices")
-    # Default mapping based on generated references
-    if "Host B" in speaker_name or "Person2" in speaker_name:
-        return os.path.abspath(os.path.join(base_dir, "host_b.wav"))
-    return os.path.abspath(os.path.join(base_dir, "host_a.wav"))
-
-
-def split_text_into_chunks(text: str, max_length: int = 150) -> List[str]:
-    """Split text into smaller chunks by semantic boundaries."""
-    if not text:
-        return []
-    
-    # If text is short enough, return as is
-    if len(text) <= max_length:
-        return [text]
-        
-    chunks = []
-    current_chunk = ""
-    
-    # Split by sentence endings first
-    # Simple split by common punctuation
-    sentences = text.replace("?", "?|").replace("!", "!|").replace(".", ".|").split("|")
-    
-    for sentence in sentences:
-        sentence = sentence.strip()
-        if not sentence:
-            continue
-            
-        # If adding this sentence exceeds max length, push current chunk
-        if len(current_chunk) + len(sentence) > max_length:
-            if current_chunk:
-                chunks.append(current_chunk)
-            current_chunk = sentence
-        else:
-            if current_chunk:
-                current_chunk += " " + sentence
-            else:
-                current_chunk = sentence
-    
-    if current_chunk:
-        chunks.append(current_chunk)
-        
-    return chunks
-
-async def generate_with_qwen(script: DialogueScript) -> str:
-    """Generate audio using QwenTTSHandler."""
-    handler = QwenTTSHandler()
-    combined_audio = AudioSegment.empty()
-    
-    print(f"[QwenTTS] Starting generation for {len(script.lines)} lines")
-    
-    temp_files = []
-    
-    try:
-        for i, line in enumerate(script.lines):
-            ref_audio = get_reference_audio(line.speaker)
-            # Use strict text to avoid empty generation issues
-            text = line.text.strip()
-            if not text:
-                continue
-            
-            # Split long text into semantic chunks for better pacing
-            chunks = split_text_into_chunks(text)
-            
-            print(f"[QwenTTS] Processing line {i+1} ({len(chunks)} chunks): {text[:30]}...")
-            
-            line_audio = AudioSegment.empty()
-            
-            for j, chunk in enumerate(chunks):
-                if not chunk.strip():
-                    continue
-                    
-                wav_path = await handler.generate(chunk, ref_audio)
-                
-                if wav_path and os.path.exists(wav_path):
-                    segment = AudioSegment.from_wav(wav_path)
-                    line_audio += segment
-                    # Short pause between sentences within a line
-                    if j < len(chunks) - 1:
-                        line_audio += AudioSegment.silent(duration=150)
-                    temp_files.append(wav_path)
-                else:
-                    print(f"[QwenTTS] Warning: No audio generated for chunk {j+1} of line {i+1}")
-            
-            if len(line_audio) > 0:
-                combined_audio += line_audio
-                # Add pause between dialogue lines
-                combined_audio += AudioSegment.silent(duration=400) 
-            
-    except Exception as e:
-        print(f"[QwenTTS] Error during generation loop: {e}")
-        # Clean up temp files
-        for f in temp_files:
-            if os.path.exists(f):
-                os.remove(f)
-        raise e
-
-    # Clean up temp files
-    for f in temp_files:
-        if os.path.exists(f):
-            os.remove(f)
-            
-    # Save combined output
-    filename = f"{uuid.uuid4()}.mp3"
-    output_dir = "./data/audio"
-    os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, filename)
-    
-    print(f"[QwenTTS] Exporting combined audio to {output_path}")
-    combined_audio.export(output_path, format="mp3")
+async def _publish_episode_audio(
+    output_path: str,
+    duration_seconds: float,
+    engine_name: str,
+    title: str,
+    sources: Optional[List[str]] = None,
+    progress_callback: Optional[Callable[[float], None]] = None,
+    background_upload: Optional[bool] = None
+) -> str:
+    """
+    Upload a finished episode MP3 when Supabase is enabled and record it in
+    the episode index.
+    With background upload the local path is returned right away; the public
+    URL is the result of ``storage_client.pending_upload(path)``.
+    """
+    if background_upload is None:
+        background_upload = settings.STORAGE_BACKGROUND_UPLOAD
+    filename = os.path.basename(output_path)
+    if progress_callback:
+        progress_callback(0.95)
+    size_bytes = os.path.getsize(output_path)
     
     # Upload to Supabase if enabled
-    if storage_client.is_enabled():
+    audio_url = None
+    if storage_client.is_enabled() and background_upload:
+        print(f"[INFO] Uploading audio to Supabase in the background: {filename}")
+        upload = storage_client.upload_in_background(output_path, filename)
+        
+        def record_url(done: asyncio.Task):
+            if not done.cancelled() and done.result():
+                episode_index.set_storage_url(filename, done.result())
+        upload.add_done_callback(record_url)
+    elif storage_client.is_enabled():
         try:
             print(f"[INFO] Uploading audio to Supabase: {filename}")
-            audio_url = storage_client.upload_audio(output_path, filename)
+            audio_url = await storage_client.upload_audio_async(output_path, filename)
             
             # Clean up local file
             if os.path.exists(output_path):
                 os.remove(output_path)
-            
-            return audio_url
         except Exception as e:
             print(f"[ERROR] Upload failed, keeping local file: {e}")
-            
-    return output_path
+    
+    episode_index.add(
+        filename,
+        title=title,
+        sources=sources or [],
+        duration_seconds=duration_seconds,
+        size_bytes=size_bytes,
+        tts_engine=engine_name,
+        local_path=None if audio_url else output_path,
+        storage_url=audio_url
+    )
+    return audio_url or output_path
+
+async def generate_with_engine(
+    script: DialogueScript,
+    engine: TTSEngine,
+    progress_callback: Optional[Callable[[float], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    background_upload: Optional[bool] = None,
+    sources: Optional[List[str]] = None
+) -> str:
+    """
+    Generate episode audio with a TTS engine and publish it (see synthesize_episode).
+    ``background_upload`` overrides STORAGE_BACKGROUND_UPLOAD; ``sources`` are
+    recorded with the episode in the index.
+    """
+    output_path, duration = await synthesize_episode(script, engine, progress_callback, cancel_event)
+    return await _publish_episode_audio(
+        output_path, duration, engine.name, script.title, sources, progress_callback, background_upload
+    )
+
+async def generate_with_engine_streaming(
+    engine: TTSEngine,
+    line_stream: AsyncIterator[DialogueLine],
+    sources: Optional[List[str]] = None
+) -> Tuple[str, DialogueScript]:
+    """
+    Synthesize dialogue lines while the script is still being generated (see
+    synthesize_streaming) and publish the episode.
+    Returns the audio path and the complete script.
+    """
+    output_path, duration, lines = await synthesize_streaming(engine, line_stream)
+    script = DialogueScript(title=title_from_lines(lines), lines=lines)
+    return await _publish_episode_audio(output_path, duration, engine.name, script.title, sources), script
+
+def resolve_engine(name: Optional[str]) -> TTSEngine:
+    """Registered TTS engine for a request (Settings.TTS_ENGINE when unset); 400 if unknown."""
+    try:
+        return get_engine(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def ingest_sources(request: ProcessingRequest) -> bool:
+    """
+    Fetch and extract all request sources concurrently into the source cache.
+    Returns the refresh_sources flag to pass on to Podcastfy: once the sources
+    have just been refreshed here, Podcastfy should read them from the cache.
+    Skipped with the source cache disabled, since Podcastfy would then fetch
+    every source again.
+    """
+    if not settings.INGEST_ENABLED or not settings.SOURCE_CACHE_ENABLED:
+        return request.force_refresh
+    await source_ingestor.ingest(request.sources, force_refresh=request.force_refresh)
+    return False
 
 @router.post("/generate", response_model=PodcastEpisode)
 async def generate_episode(request: ProcessingRequest):
     """
     Generate a podcast episode from the provided sources.
-    Uses Podcastfy for script generation and TTS.
+    Uses Podcastfy (or a streaming Gemini call) for the script and the
+    requested TTS engine for the audio.
     """
     print(f"[DEBUG] Received request: sources={len(request.sources)}, tts_engine={request.tts_engine}")
     for i, src in enumerate(request.sources):
@@ -168,31 +161,36 @@ async def generate_episode(request: ProcessingRequest):
     if not urls:
         raise HTTPException(status_code=400, detail="No valid sources provided.")
 
+    engine = resolve_engine(request.tts_engine)
+    tts_engine = engine.name
+
     try:
-        # Normalize TTS engine name
-        tts_engine = request.tts_engine or "edge"
-        
-        # 1. Generate Script first (we need script to pass to Qwen if selected)
-        # Using podcastfy just for script generation is safer if we want to intercept TTS
+        # 0. Fetch all sources concurrently ahead of script generation
+        refresh_sources = await ingest_sources(request)
         
-        if tts_engine == "qwen":
-            # Generate script only
-            script = await asyncio.to_thread(
-                podcastfy_client.generate_script_only,
-                urls=urls
+        if (
+            settings.SCRIPT_STREAMING_ENABLED
+            and not refresh_sources
+            # Reads every cached source from disk
+            and await asyncio.to_thread(podcastfy_client.source_texts, urls) is not None
+        ):
+            # Stream the script from Gemini and synthesize lines as they arrive
+            audio_path, script = await generate_with_engine_streaming(
+                engine,
+                podcastfy_client.stream_script_lines(urls, force_refresh=request.force_refresh),
+                sources=source_names
             )
-            # Generate Audio with Qwen
-            audio_path = await generate_with_qwen(script)
         else:
-            # Use original flow (Edge TTS via Podcastfy)
-            if tts_engine == "edge-tts": 
-                tts_engine = "edge"
-                
-            audio_path, script = await asyncio.to_thread(
-                podcastfy_client.generate_from_urls,
-                urls,
-                tts_engine
+            # 1. Generate the script with Podcastfy, 2. synthesize it line by line
+            script = await asyncio.to_thread(
+                podcastfy_client.generate_script_only,
+                urls=urls,
+                force_refresh=request.force_refresh,
+                refresh_sources=refresh_sources
             )
+            audio_path = await generate_with_engine(script, engine, sources=source_names)
+        
+        episode = episode_index.find(audio_path) if audio_path else None
         
         # Sanitize path
         if audio_path:
@@ -209,7 +207,7 @@ async def generate_episode(request: ProcessingRequest):
         file_path=audio_path,
         metadata=PodcastMetadata(
             title=script.title,
-            duration_seconds=0.0,
+            duration_seconds=episode.duration_seconds if episode else 0.0,
             sources=source_names,
             created_at=datetime.now()
         ),
@@ -217,16 +215,51 @@ async def generate_episode(request: ProcessingRequest):
     )
 
 @router.get("/episodes")
-async def list_episodes():
-    """List all generated podcast episodes."""
-    files = []
-    # Scan Podcastfy output directory
-    audio_dir = "./data/audio"
-    if os.path.exists(audio_dir):
-        for f in os.listdir(audio_dir):
-            if f.endswith(".mp3"):
-                files.append(f)
-    return {"episodes": files}
+async def list_episodes(limit: Optional[int] = Query(None, ge=1), offset: int = Query(0, ge=0)):
+    """
+    List locally stored podcast episode files, newest first (served from the episode index).
+    Without ``limit`` every episode is returned, as before the index existed.
+    """
+    episodes, total = episode_index.list(limit=limit, offset=offset, local_only=True)
+    return {"episodes": [episode.file_name for episode in episodes], "total": total}
+
+@router.get("/episodes/catalog", response_model=EpisodeListResponse)
+async def list_episode_catalog(
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    sort_by: Literal["created_at", "title", "duration_seconds", "size_bytes"] = "created_at",
+    order: Literal["asc", "desc"] = "desc",
+    tts_engine: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    q: Optional[str] = Query(None, description="Search in episode titles")
+):
+    """Paginated episode metadata, sorted and filtered in the episode index."""
+    episodes, total = episode_index.list(
+        limit=limit,
+        offset=offset,
+        sort_by=sort_by,
+        order=order,
+        tts_engine=tts_engine,
+        since=since,
+        until=until,
+        search=q
+    )
+    return EpisodeListResponse(episodes=episodes, total=total, limit=limit, offset=offset)
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Hit/miss counters and sizes of the server-side caches."""
+    return {
+        "tts_chunks": tts_chunk_cache.stats(),
+        "sources": source_cache.stats(),
+        "scripts": script_cache.stats()
+    }
+
+@router.get("/tts/chunk-stats")
+async def get_chunk_stats():
+    """Length statistics of the text chunks sent to TTS since startup."""
+    return text_chunker.stats()
 
 @router.post("/generate-script", response_model=ScriptResponse)
 async def generate_script_only(request: ProcessingRequest):
@@ -242,9 +275,12 @@ async def generate_script_only(request: ProcessingRequest):
         raise HTTPException(status_code=400, detail="No valid sources provided.")
 
     try:
+        refresh_sources = await ingest_sources(request)
         script = await asyncio.to_thread(
             podcastfy_client.generate_script_only,
-            urls=urls
+            urls=urls,
+            force_refresh=request.force_refresh,
+            refresh_sources=refresh_sources
         )
     except Exception as e:
         print(f"[ERROR] Script generation failed: {e}")
@@ -265,20 +301,12 @@ async def generate_audio_from_script(request: AudioFromScriptRequest):
     if not request.script.lines:
         raise HTTPException(status_code=400, detail="Script has no dialogue lines.")
 
+    engine = resolve_engine(request.tts_engine)
+    tts_engine = engine.name
+
     try:
-        tts_engine = request.tts_engine or "edge"
-        
-        if tts_engine == "qwen":
-            audio_path = await generate_with_qwen(request.script)
-        else:
-            if tts_engine == "edge-tts":
-                tts_engine = "edge"
-            audio_path = await asyncio.to_thread(
-                podcastfy_client.generate_audio_from_script,
-                request.script,
-                tts_engine
-            )
-            
+        audio_path = await generate_with_engine(request.script, engine)
+
         print(f"[INFO] Audio generated: {audio_path}")
     except Exception as e:
         print(f"[ERROR] Audio generation failed: {e}")
@@ -289,54 +317,197 @@ async def generate_audio_from_script(request: AudioFromScriptRequest):
         tts_engine_used=tts_engine
     )
 
+@router.post("/generate-audio-stream")
+async def generate_audio_stream(request: AudioFromScriptRequest):
+    """
+    Stream one continuous MP3 while synthesis is still running.
+    The response starts once the first line is encoded, so failures up to
+    then return a 500. A later failure aborts the response without the end
+    of the chunked body, which clients see as an incomplete transfer rather
+    than a successful, shorter file.
+    """
+    if not request.script.lines:
+        raise HTTPException(status_code=400, detail="Script has no dialogue lines.")
+    engine = resolve_engine(request.tts_engine)
+
+    stream = stream_mp3(iter_engine_lines(request.script, engine), settings.MP3_BITRATE)
+    try:
+        first = await stream.__anext__()
+    except StopAsyncIteration:
+        raise HTTPException(status_code=500, detail=f"No audio generated by {engine.name}")
+    except Exception as e:
+        await stream.aclose()
+        print(f"[ERROR] Audio streaming failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Audio streaming failed: {str(e)}")
+
+    async def audio_stream():
+        sent = len(first)
+        yield first
+        try:
+            async for data in stream:
+                sent += len(data)
+                yield data
+        except Exception as e:
+            print(f"[ERROR] Audio streaming failed after {sent} bytes, aborting the response: {e}")
+            raise
+
+    return StreamingResponse(audio_stream(), media_type="audio/mpeg")
+
+@router.post("/generate-audio-hls", response_model=StreamResponse, status_code=202)
+async def generate_audio_hls(request: AudioFromScriptRequest, background_tasks: BackgroundTasks):
+    """
+    Start line-by-line synthesis into an HLS event playlist under /data/hls.
+    The playlist URL is returned immediately and grows as lines are ready.
+    The stream ID is also a task ID: poll /tasks/{stream_id} to tell a
+    finished stream from a failed one, whose playlist never gets an end tag.
+    """
+    if not request.script.lines:
+        raise HTTPException(status_code=400, detail="Script has no dialogue lines.")
+    engine = resolve_engine(request.tts_engine)
+
+    stream_id = task_manager.create_task()
+    writer = HLSSegmentWriter(stream_id)
+    background_tasks.add_task(run_hls_task, writer, request.script, engine)
+
+    return StreamResponse(
+        stream_id=stream_id,
+        playlist_url=f"/data/hls/{stream_id}/{PLAYLIST_NAME}"
+    )
+
+async def run_hls_task(writer: HLSSegmentWriter, script: DialogueScript, engine: TTSEngine):
+    task = task_manager.get_task(writer.stream_id)
+    if not task or task.status == "cancelled":
+        return
+
+    task.set_status("running")
+    try:
+        async for pcm, sample_rate in iter_engine_lines(script, engine):
+            if task.cancellation_event.is_set():
+                print(f"[HLS {writer.stream_id}] Stopped after cancellation.")
+                return
+            mp3_bytes = await asyncio.to_thread(encode_mp3, pcm, sample_rate)
+            writer.add_segment(mp3_bytes, len(pcm) / sample_rate)
+            task.update_progress(len(writer.segments) / len(script.lines))
+    except Exception as e:
+        # Leave the playlist without #EXT-X-ENDLIST so it never looks complete
+        print(f"[HLS {writer.stream_id}] Failed after {len(writer.segments)} segments: {e}")
+        task.error = str(e)
+        task.set_status("failed")
+        raise
+
+    writer.close()
+    task.result = f"/data/hls/{writer.stream_id}/{PLAYLIST_NAME}"
+    task.update_progress(1.0)
+    task.set_status("completed")
+
 @router.post("/generate-audio-async", response_model=AsyncTaskResponse, status_code=202)
-async def generate_audio_async(request: AudioFromScriptRequest, background_tasks: BackgroundTasks):
+async def generate_audio_async(request: AudioFromScriptRequest):
     """
-    Start audio generation asynchronously. Returns a task ID.
+    Queue audio generation. Returns a task ID and the job's queue position,
+    or 429 when the queue is full.
     """
+    engine = resolve_engine(request.tts_engine)
     task_id = task_manager.create_task()
     
-    background_tasks.add_task(
-        run_tts_task,
-        task_id,
-        request.script,
-        request.tts_engine
-    )
+    try:
+        position = job_scheduler.submit(
+            task_id,
+            lambda: run_tts_task(task_id, request.script, engine),
+            priority=request.priority
+        )
+    except QueueFullError as e:
+        task_manager.remove_task(task_id)
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
     
-    return AsyncTaskResponse(task_id=task_id)
+    return AsyncTaskResponse(task_id=task_id, queue_position=position)
 
 @router.get("/tasks/{task_id}", response_model=TaskStatusResponse)
 async def get_task_status(task_id: str):
     task = task_manager.get_task(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    return task.to_status_model()
+    status = task.to_status_model()
+    status.queue_position = job_scheduler.position(task_id)
+    return status
+
+@router.get("/tasks/{task_id}/events")
+async def stream_task_events(task_id: str):
+    """
+    Server-sent events with the task status on every change.
+    The stream ends after the completed/failed/cancelled event.
+    """
+    if not task_manager.get_task(task_id):
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    async def event_stream():
+        async for status in task_manager.watch(task_id, heartbeat=15.0):
+            if status is None:
+                yield ": keep-alive\n\n"
+                continue
+            status.queue_position = job_scheduler.position(task_id)
+            yield f"event: status\ndata: {status.model_dump_json()}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/tasks/{task_id}/ws")
+async def task_status_socket(websocket: WebSocket, task_id: str):
+    """WebSocket variant of /tasks/{task_id}/events; closes when the task finishes."""
+    await websocket.accept()
+    if not task_manager.get_task(task_id):
+        await websocket.close(code=4404, reason="Task not found")
+        return
+
+    try:
+        async for status in task_manager.watch(task_id):
+            status.queue_position = job_scheduler.position(task_id)
+            await websocket.send_text(status.model_dump_json())
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
+@router.get("/tasks", response_model=List[TaskStatusResponse])
+async def list_tasks(status: Optional[str] = None, limit: int = 100):
+    """List tasks, newest first, optionally filtered by status."""
+    return [task.to_status_model() for task in task_manager.list_tasks(status=status, limit=limit)]
 
 @router.post("/tasks/{task_id}/cancel")
 async def cancel_task(task_id: str):
     if task_manager.cancel_task(task_id):
+        # A job still waiting in the queue is dropped right away
+        job_scheduler.discard(task_id)
         return {"message": "Task cancellation requested"}
     raise HTTPException(status_code=404, detail="Task not found or cannot be cancelled")
 
-async def run_tts_task(task_id: str, script: DialogueScript, engine_name: Optional[str]):
+async def run_tts_task(task_id: str, script: DialogueScript, engine: TTSEngine):
     task = task_manager.get_task(task_id)
-    if not task:
+    if not task or task.status == "cancelled":
         return
 
     try:
         task.set_status("running")
         
-        tts_engine = engine_name or "edge"
-        
-        if tts_engine == "qwen":
-            audio_path = await generate_with_qwen(script)
+        if engine.cpu_bound and settings.TTS_EXECUTOR == "process":
+            output_path, duration = await job_scheduler.run_in_process(
+                run_tts_job,
+                script.model_dump_json(),
+                engine.name,
+                progress_callback=task.update_progress,
+                cancel_event=task.cancellation_event
+            )
+            # The worker only synthesizes; upload and index from this process
+            audio_path = await _publish_episode_audio(
+                output_path, duration, engine.name, script.title, progress_callback=task.update_progress
+            )
         else:
-            if tts_engine == "edge-tts":
-                tts_engine = "edge"
-            audio_path = await asyncio.to_thread(
-                podcastfy_client.generate_audio_from_script,
+            audio_path = await generate_with_engine(
                 script,
-                tts_engine
+                engine,
+                progress_callback=task.update_progress,
+                cancel_event=task.cancellation_event
             )
         
         if task.status == "cancelled":
@@ -344,15 +515,54 @@ async def run_tts_task(task_id: str, script: DialogueScript, engine_name: Option
             return
 
         task.result = audio_path
+        task.update_progress(1.0)
         task.set_status("completed")
-        task.progress = 1.0
         
+        # Swap in the public URL once a background upload finishes
+        upload = storage_client.pending_upload(audio_path)
+        if upload is not None:
+            def swap_result(done: asyncio.Task):
+                if not done.cancelled() and done.result():
+                    task.set_result(done.result())
+            upload.add_done_callback(swap_result)
+        
+    except GenerationCancelled:
+        print(f"[Task {task_id}] Generation stopped after cancellation.")
     except Exception as e:
+        if task.status == "cancelled":
+            print(f"[Task {task_id}] Task was cancelled, ignoring error: {e}")
+            return
         print(f"[Task {task_id}] Failed: {e}")
         task.error = str(e)
         task.set_status("failed")
 
 
+@router.post("/episodes/delete", response_model=EpisodeBulkDeleteResponse)
+async def delete_episodes_bulk(request: EpisodeBulkDeleteRequest):
+    """
+    Delete many episodes at once.
+    Supabase files are removed in batches rather than one request per file.
+    """
+    invalid = [name for name in request.filenames if os.path.basename(name) != name or not name]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid episode file names: {invalid[:10]}")
+    
+    result = await asyncio.to_thread(delete_episodes, request.filenames)
+    print(f"[INFO] Bulk delete: {len(result['deleted'])}/{len(request.filenames)} episodes deleted")
+    return EpisodeBulkDeleteResponse(**result)
+
+@router.post("/episodes/retention", status_code=202)
+async def run_episode_retention(background_tasks: BackgroundTasks):
+    """
+    Run the retention policy now, in the background.
+    Returns 409 when RETENTION_ENABLED is off, so the destructive pass only
+    runs where an operator has opted into the policy.
+    """
+    if not settings.RETENTION_ENABLED:
+        raise HTTPException(status_code=409, detail="Episode retention is disabled (RETENTION_ENABLED=false)")
+    background_tasks.add_task(episode_retention.run)
+    return {"message": "Retention pass started"}
+
 @router.delete("/episodes/{filename}")
 async def delete_episode(filename: str):
     """
@@ -388,6 +598,7 @@ async def delete_episode(filename: str):
             error_msg += f"Supabase delete failed: {str(e)}; "
 
     if deleted:
+        episode_index.delete([filename])
         return {"message": f"Episode {filename} deleted successfully", "details": error_msg}
     else:
         # If we couldn't delete it from anywhere (and it didn't exist locally), return 404
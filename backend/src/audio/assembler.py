@@ -0,0 +1,120 @@
+import time
+import numpy as np
+from typing import List, Optional, Protocol
+from pydub import AudioSegment
+
+# Pauses inserted between audio pieces
+CHUNK_GAP_MS = 150  # between sentence chunks within one dialogue line
+LINE_GAP_MS = 400   # after each dialogue line
+
+
+def pcm_to_int16(pcm: np.ndarray) -> np.ndarray:
+    """Convert float PCM in [-1, 1] to 16-bit integer samples."""
+    pcm = np.clip(np.asarray(pcm, dtype=np.float32), -1.0, 1.0)
+    return (pcm * 32767).astype(np.int16)
+
+
+def pcm_to_segment(pcm: np.ndarray, sample_rate: int) -> AudioSegment:
+    """Wrap float PCM into a 16-bit mono AudioSegment (for export only)."""
+    return AudioSegment(
+        pcm_to_int16(pcm).tobytes(),
+        frame_rate=sample_rate,
+        sample_width=2,
+        channels=1
+    )
+
+
+class AudioSink(Protocol):
+    """Destination that consumes an episode's PCM in order (e.g. MP3FileEncoder)."""
+
+    def write(self, pcm: np.ndarray): ...
+
+    def write_silence(self, samples: int): ...
+
+
+class AudioAssembler:
+    """
+    Assembles per-chunk PCM arrays into a single episode buffer.
+
+    Lines are only referenced while they are added; the final buffer is
+    allocated once in ``build`` and every chunk is copied into place, with
+    silences left as zeros. This avoids writing temporary WAV files and the
+    quadratic copying of repeated ``AudioSegment +=``.
+
+    With a ``sink`` each line is written out (chunks and pauses) as soon as
+    it is added and nothing is kept, so memory does not grow with the
+    episode; ``build`` is then unavailable. ``busy_seconds`` is the time
+    spent in ``add_line`` and ``build``, including writes to the sink.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        chunk_gap_ms: int = CHUNK_GAP_MS,
+        line_gap_ms: int = LINE_GAP_MS,
+        sink: Optional[AudioSink] = None
+    ):
+        self.sample_rate = sample_rate
+        self.chunk_gap = int(sample_rate * chunk_gap_ms / 1000)
+        self.line_gap = int(sample_rate * line_gap_ms / 1000)
+        self.sink = sink
+        self._lines: List[List[np.ndarray]] = []
+        self._written_samples = 0
+        self.busy_seconds = 0.0
+
+    def add_line(self, chunks: List[Optional[np.ndarray]]) -> bool:
+        """
+        Queue the chunks of one dialogue line.
+        Empty chunks are skipped; returns False if the whole line was empty.
+        """
+        start = time.perf_counter()
+        try:
+            return self._add_line(chunks)
+        finally:
+            self.busy_seconds += time.perf_counter() - start
+
+    def _add_line(self, chunks: List[Optional[np.ndarray]]) -> bool:
+        chunks = [np.asarray(c, dtype=np.float32).reshape(-1) for c in chunks if c is not None and len(c) > 0]
+        if not chunks:
+            return False
+        if self.sink is None:
+            self._lines.append(chunks)
+            return True
+        for j, chunk in enumerate(chunks):
+            self.sink.write(chunk)
+            if j < len(chunks) - 1:
+                self.sink.write_silence(self.chunk_gap)
+        self.sink.write_silence(self.line_gap)
+        self._written_samples += self.line_samples(chunks)
+        return True
+
+    def line_samples(self, chunks: List[np.ndarray]) -> int:
+        """Number of samples a line occupies, including its gaps."""
+        return sum(len(c) for c in chunks) + self.chunk_gap * (len(chunks) - 1) + self.line_gap
+
+    @property
+    def total_samples(self) -> int:
+        return self._written_samples + sum(self.line_samples(chunks) for chunks in self._lines)
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.total_samples / self.sample_rate if self.sample_rate else 0.0
+
+    def build(self) -> np.ndarray:
+        """Return the assembled episode as one float32 PCM array."""
+        if self.sink is not None:
+            raise RuntimeError("Lines were written to the sink; there is no buffer to build")
+        start = time.perf_counter()
+        buffer = np.zeros(self.total_samples, dtype=np.float32)
+        pos = 0
+        for chunks in self._lines:
+            for j, chunk in enumerate(chunks):
+                buffer[pos:pos + len(chunk)] = chunk
+                pos += len(chunk)
+                # Short pause between sentences within a line
+                if j < len(chunks) - 1:
+                    pos += self.chunk_gap
+            # Pause between dialogue lines
+            pos += self.line_gap
+        self.busy_seconds += time.perf_counter() - start
+        return buffer
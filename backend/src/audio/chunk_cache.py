@@ -0,0 +1,131 @@
+import os
+import re
+import hashlib
+import threading
+import unicodedata
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from src.config import settings
+
+
+def normalize_text(text: str) -> str:
+    """Normalize chunk text so trivial edits (spacing, NFC/NFD) still hit the cache."""
+    text = unicodedata.normalize("NFC", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class TTSChunkCache:
+    """
+    Content-addressed cache of synthesized TTS chunks.
+
+    Entries are keyed by (engine, model id, voice hash, normalized text) and
+    stored as 16-bit PCM ``.npz`` files. The cache is bounded by total size on
+    disk and evicts the least recently used entries first; recency survives
+    restarts through file mtimes.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size in bytes
+        self._total_bytes = 0
+        self._load_index()
+
+    @staticmethod
+    def make_key(engine: str, model_id: str, voice_hash: str, text: str) -> str:
+        payload = "\x1f".join([engine, model_id, voice_hash, normalize_text(text)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[np.ndarray, int]]:
+        """Return (float PCM, sample rate) for a key, or None on a miss."""
+        path = self._path(key)
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        try:
+            with np.load(path) as data:
+                pcm = data["pcm"].astype(np.float32) / 32767
+                sample_rate = int(data["sample_rate"])
+            os.utime(path)
+            return pcm, sample_rate
+        except Exception as e:
+            print(f"[TTSCache] Dropping unreadable entry {key[:12]}: {e}")
+            self._remove(key)
+            return None
+
+    def put(self, key: str, wav: np.ndarray, sample_rate: int):
+        """Store a synthesized chunk and evict old entries beyond the size limit."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        pcm = (np.clip(np.asarray(wav, dtype=np.float32), -1.0, 1.0) * 32767).astype(np.int16)
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, pcm=pcm, sample_rate=sample_rate)
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+
+        with self._lock:
+            self._total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            evicted = []
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                old_key, old_size = self._entries.popitem(last=False)
+                self._total_bytes -= old_size
+                evicted.append(old_key)
+
+        for old_key in evicted:
+            self._delete_file(old_key)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _load_index(self):
+        """Rebuild the LRU order from files on disk (oldest mtime first)."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".npz"):
+                continue
+            st = os.stat(os.path.join(self.cache_dir, name))
+            files.append((st.st_mtime, name[:-4], st.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def _remove(self, key: str):
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+        self._delete_file(key)
+
+    def _delete_file(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+
+tts_chunk_cache = TTSChunkCache(
+    cache_dir=os.path.join(settings.DATA_DIR, "cache", "tts"),
+    max_bytes=settings.TTS_CACHE_MAX_MB * 1024 * 1024
+)
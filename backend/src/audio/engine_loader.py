@@ -0,0 +1,41 @@
+import asyncio
+import threading
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from src.audio.qwen_handler import QwenTTSHandler
+
+# qwen_handler pulls in torch, qwen_tts and transformers, which take seconds
+# to import and are not needed by edge-tts deployments. Keep them out of the
+# import graph until the qwen engine is actually used.
+_qwen_handler: Optional["QwenTTSHandler"] = None
+_qwen_lock = threading.Lock()
+
+
+def get_qwen_handler() -> "QwenTTSHandler":
+    """
+    Import and load the Qwen handler on first use.
+    Blocking (model download/load); call via asyncio.to_thread from async code.
+    """
+    global _qwen_handler
+    if _qwen_handler is not None:
+        return _qwen_handler
+    with _qwen_lock:
+        if _qwen_handler is None:
+            from src.audio.qwen_handler import QwenTTSHandler
+            _qwen_handler = QwenTTSHandler()
+    return _qwen_handler
+
+
+def is_qwen_loaded() -> bool:
+    return _qwen_handler is not None
+
+
+async def warm_up_qwen():
+    """Load the Qwen model in the background so the first request doesn't pay for it."""
+    try:
+        print("[EngineLoader] Warming up Qwen TTS...")
+        await asyncio.to_thread(get_qwen_handler)
+        print("[EngineLoader] Qwen TTS ready.")
+    except Exception as e:
+        print(f"[EngineLoader] Qwen warm-up failed: {e}")
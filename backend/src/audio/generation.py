@@ -0,0 +1,274 @@
+import os
+import uuid
+import asyncio
+import threading
+import numpy as np
+from typing import TYPE_CHECKING, AsyncIterator, Callable, List, Optional, Tuple
+from src.config import settings
+from src.models import DialogueLine, DialogueScript
+from src.audio.assembler import AudioAssembler
+from src.audio.streaming import MP3FileEncoder
+from src.audio.text_chunker import text_chunker
+from src.metrics import AUDIO_ASSEMBLY_SECONDS, MP3_ENCODE_SECONDS
+
+if TYPE_CHECKING:
+    from src.audio.tts_engines import TTSEngine
+
+# Synthesis driver shared by the API and the TTS worker processes. Worker
+# processes import this module (and not src.api_router), so it must stay free
+# of import-time side effects: no task store, episode index, storage or
+# Podcastfy singletons. Publishing an episode happens in the web process.
+
+# Share of the progress bar covered by synthesis; the rest is export/upload
+SYNTHESIS_PROGRESS = 0.9
+
+
+class GenerationCancelled(Exception):
+    """Raised inside a generation loop once its task has been cancelled."""
+
+
+def _collect_items(engine: "TTSEngine", lines: List[DialogueLine]) -> Tuple[List[Tuple[str, str]], List[List[int]]]:
+    """
+    Split every line into chunks for synthesis.
+    Returns the (text, voice) items and, per non-empty line, its indices into items.
+    """
+    items = []  # (text, voice)
+    line_chunks = []  # per line: indices into items
+    for i, line in enumerate(lines):
+        voice = engine.voice_for(line.speaker)
+        # Use strict text to avoid empty generation issues
+        text = line.text.strip()
+        if not text:
+            continue
+
+        # Split into sentence-aligned chunks of balanced length
+        chunks = text_chunker.split(text)
+        if not chunks:
+            continue
+
+        print(f"[TTS:{engine.name}] Queued line {i+1} ({len(chunks)} chunks): {text[:30]}...")
+
+        indices = []
+        for chunk in chunks:
+            indices.append(len(items))
+            items.append((chunk, voice))
+        line_chunks.append(indices)
+    return items, line_chunks
+
+def _line_windows(line_chunks: List[List[int]], max_chunks: int, first_alone: bool = False) -> List[Tuple[int, int]]:
+    """
+    Group consecutive lines into (start, end) windows of at most ``max_chunks``
+    chunks (a longer line gets a window of its own). With ``first_alone`` the
+    first line is its own window so its audio is ready as early as possible.
+    """
+    windows = []
+    start = 0
+    while start < len(line_chunks):
+        end = start + 1
+        if not (first_alone and start == 0):
+            count = len(line_chunks[start])
+            while end < len(line_chunks) and count + len(line_chunks[end]) <= max_chunks:
+                count += len(line_chunks[end])
+                end += 1
+        windows.append((start, end))
+        start = end
+    return windows
+
+def _new_episode_path() -> str:
+    output_dir = "./data/audio"
+    os.makedirs(output_dir, exist_ok=True)
+    return os.path.join(output_dir, f"{uuid.uuid4()}.mp3")
+
+def _open_episode_encoder(output_path: str, sample_rate: int) -> AudioAssembler:
+    """Assembler that encodes each added line straight into ``output_path``."""
+    return AudioAssembler(sample_rate, sink=MP3FileEncoder(output_path, sample_rate, settings.MP3_BITRATE))
+
+def _write_lines(
+    assembler: AudioAssembler,
+    engine_name: str,
+    items: List[Tuple[str, str]],
+    wavs: List[np.ndarray],
+    line_chunks: List[List[int]],
+    offset: int = 0
+):
+    """Add lines to the assembler; ``wavs[i - offset]`` is the audio of ``items[i]``."""
+    for indices in line_chunks:
+        if not assembler.add_line([wavs[index - offset] for index in indices]):
+            print(f"[TTS:{engine_name}] Warning: No audio generated for line: {items[indices[0]][0][:30]}...")
+
+async def _finish_episode(assembler: AudioAssembler, engine_name: str) -> Tuple[str, float]:
+    """
+    Close the episode's MP3 encoder; returns (path, duration in seconds).
+    Callers abort the encoder if this raises.
+    """
+    encoder = assembler.sink
+    # Encoder writes happen inside add_line; assembly is the rest of its time
+    AUDIO_ASSEMBLY_SECONDS.observe(max(assembler.busy_seconds - encoder.busy_seconds, 0.0))
+    await asyncio.to_thread(encoder.close)
+    MP3_ENCODE_SECONDS.observe(encoder.busy_seconds)
+    print(f"[TTS:{engine_name}] Saved {assembler.duration_seconds:.1f}s of audio to {encoder.path}")
+    return encoder.path, assembler.duration_seconds
+
+async def synthesize_episode(
+    script: DialogueScript,
+    engine: "TTSEngine",
+    progress_callback: Optional[Callable[[float], None]] = None,
+    cancel_event: Optional[threading.Event] = None
+) -> Tuple[str, float]:
+    """
+    Synthesize a script into a local MP3; returns (path, duration in seconds).
+    Lines are synthesized in windows of TTS_WINDOW_CHUNKS chunks: batch engines
+    (qwen) batch within a window, the others synthesize its chunks concurrently
+    within the engine's concurrency and rate limits. Each window is encoded to
+    MP3 as soon as it is done, so memory stays bounded for long episodes.
+    Reports progress (0.0-SYNTHESIS_PROGRESS) per synthesized chunk through
+    ``progress_callback`` and raises GenerationCancelled as soon as
+    ``cancel_event`` is set.
+    """
+    print(f"[TTS:{engine.name}] Starting generation for {len(script.lines)} lines")
+
+    items, line_chunks = _collect_items(engine, script.lines)
+    if not items:
+        raise RuntimeError(f"No audio generated by {engine.name}")
+
+    output_path = _new_episode_path()
+    assembler: Optional[AudioAssembler] = None
+    try:
+        for start, end in _line_windows(line_chunks, max(settings.TTS_WINDOW_CHUNKS, engine.window_size)):
+            window = line_chunks[start:end]
+            offset = window[0][0]
+
+            def on_chunks_done(done: int, total: int):
+                if progress_callback:
+                    progress_callback(SYNTHESIS_PROGRESS * (offset + done) / len(items))
+
+            try:
+                wavs, sample_rate = await engine.synthesize_batch(
+                    items[offset:window[-1][-1] + 1], on_chunks_done, cancel_event
+                )
+            except GenerationCancelled:
+                raise
+            except Exception as e:
+                print(f"[TTS:{engine.name}] Error during generation: {e}")
+                raise e
+
+            if cancel_event is not None and cancel_event.is_set():
+                raise GenerationCancelled("Generation cancelled")
+
+            if assembler is None:
+                print(f"[TTS:{engine.name}] Encoding audio to {output_path}")
+                assembler = _open_episode_encoder(output_path, sample_rate)
+            await asyncio.to_thread(_write_lines, assembler, engine.name, items, wavs, window, offset)
+
+        return await _finish_episode(assembler, engine.name)
+    except BaseException:
+        if assembler is not None:
+            assembler.sink.abort()
+        raise
+
+async def iter_engine_lines(script: DialogueScript, engine: "TTSEngine") -> AsyncIterator[Tuple[np.ndarray, int]]:
+    """
+    Yield each dialogue line's PCM (including its pauses) as soon as it is ready.
+    The first line is synthesized alone for a fast first audio; later lines are
+    grouped into windows of about ``engine.window_size`` chunks to keep batching
+    (qwen) or concurrent requests (hosted engines) busy.
+    """
+    items, line_chunks = _collect_items(engine, script.lines)
+    if not items:
+        raise RuntimeError(f"No audio generated by {engine.name}")
+
+    for start, end in _line_windows(line_chunks, engine.window_size, first_alone=True):
+        window = line_chunks[start:end]
+        wavs, sample_rate = await engine.synthesize_batch([items[i] for line in window for i in line])
+
+        offset = 0
+        for indices in window:
+            assembler = AudioAssembler(sample_rate)
+            if assembler.add_line(wavs[offset:offset + len(indices)]):
+                yield assembler.build(), sample_rate
+            offset += len(indices)
+
+async def synthesize_streaming(
+    engine: "TTSEngine",
+    line_stream: AsyncIterator[DialogueLine]
+) -> Tuple[str, float, List[DialogueLine]]:
+    """
+    Synthesize dialogue lines while the script is still being generated.
+    A producer task moves lines from ``line_stream`` into a queue; the synthesis
+    loop takes whatever lines are waiting (up to ``engine.window_size``) as one
+    batch, so audio starts after the first line and later lines still batch well.
+    Each batch is encoded to MP3 right away.
+    Returns the audio path, its duration and all lines received.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def produce():
+        try:
+            async for line in line_stream:
+                await queue.put(line)
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(None)
+
+    producer = asyncio.create_task(produce())
+    lines: List[DialogueLine] = []
+    output_path = _new_episode_path()
+    assembler: Optional[AudioAssembler] = None
+    try:
+        finished = False
+        while not finished:
+            window = [await queue.get()]
+            while not queue.empty() and len(window) < engine.window_size:
+                window.append(queue.get_nowait())
+
+            batch = []
+            for item in window:
+                if item is None:
+                    finished = True
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    batch.append(item)
+
+            items, line_chunks = _collect_items(engine, batch)
+            lines.extend(batch)
+            if not items:
+                continue
+
+            wavs, sample_rate = await engine.synthesize_batch(items)
+            if assembler is None:
+                assembler = _open_episode_encoder(output_path, sample_rate)
+            await asyncio.to_thread(_write_lines, assembler, engine.name, items, wavs, line_chunks)
+            print(f"[TTS:{engine.name}] Streamed {len(lines)} lines so far")
+
+        if assembler is None:
+            raise RuntimeError(f"No audio generated by {engine.name}")
+        output_path, duration = await _finish_episode(assembler, engine.name)
+    except BaseException:
+        if assembler is not None:
+            assembler.sink.abort()
+        raise
+    finally:
+        producer.cancel()
+    return output_path, duration, lines
+
+def run_tts_job(script_json: str, engine_name: str, cancel_event=None, progress_value=None) -> Tuple[str, float]:
+    """
+    Entry point for CPU-bound TTS jobs (qwen) in a worker process.
+    The process keeps its own engine and model singletons, so the model is
+    loaded once per worker and inference never runs in the web process.
+    Only synthesizes and encodes; the parent uploads and indexes the episode.
+    ``cancel_event`` / ``progress_value`` are manager proxies shared with the parent.
+    Returns (local MP3 path, duration in seconds).
+    """
+    from src.audio.tts_engines import get_engine
+
+    def report(progress: float):
+        if progress_value is not None:
+            progress_value.value = progress
+
+    script = DialogueScript.model_validate_json(script_json)
+    return asyncio.run(synthesize_episode(
+        script, get_engine(engine_name), progress_callback=report, cancel_event=cancel_event
+    ))
@@ -0,0 +1,151 @@
+import asyncio
+import itertools
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from src.config import settings
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at capacity (mapped to HTTP 429)."""
+
+
+class JobScheduler:
+    """
+    Bounded priority queue in front of the TTS jobs.
+
+    A fixed number of worker coroutines pull jobs in (priority, arrival)
+    order, so at most ``workers`` jobs synthesize at once. When the queue
+    is full ``submit`` raises QueueFullError instead of accepting more work.
+    CPU-heavy jobs can be offloaded with ``run_in_process``.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._waiting: Dict[str, Tuple[int, int]] = {}  # task_id -> (priority, seq)
+        self._seq = itertools.count()
+        self._running = 0
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._manager = None  # multiprocessing manager for cross-process progress/cancel
+
+    @property
+    def depth(self) -> int:
+        """Number of jobs waiting to start."""
+        return len(self._waiting)
+
+    @property
+    def running(self) -> int:
+        """Number of jobs currently executing."""
+        return self._running
+
+    def submit(
+        self,
+        task_id: str,
+        job: Callable[[], Awaitable[Any]],
+        priority: int = 0
+    ) -> int:
+        """
+        Queue a job; lower ``priority`` values run first, FIFO within a priority.
+        Returns the 1-based queue position of the job.
+        """
+        self._ensure_workers()
+        if len(self._waiting) >= self.max_queue:
+            raise QueueFullError(f"TTS queue is full ({self.max_queue} jobs waiting)")
+
+        entry = (priority, next(self._seq))
+        self._waiting[task_id] = entry
+        self._queue.put_nowait((entry[0], entry[1], task_id, job))
+        return self.position(task_id)
+
+    def position(self, task_id: str) -> Optional[int]:
+        """1-based position in the queue, or None if the job is not waiting."""
+        entry = self._waiting.get(task_id)
+        if entry is None:
+            return None
+        return 1 + sum(1 for other in self._waiting.values() if other < entry)
+
+    def discard(self, task_id: str) -> bool:
+        """
+        Drop a job that has not started yet (its task was cancelled), so it no
+        longer counts against the queue size. Workers skip its queue entry.
+        Returns whether the job was waiting.
+        """
+        return self._waiting.pop(task_id, None) is not None
+
+    async def run_in_process(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        progress_callback: Optional[Callable[[float], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Any:
+        """
+        Run ``fn(*args, cancel_proxy, progress_proxy)`` in the worker process pool.
+        The parent mirrors ``cancel_event`` into the child and forwards the
+        child's progress to ``progress_callback`` while the job runs.
+        """
+        context = multiprocessing.get_context("spawn")
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            self._manager = context.Manager()
+
+        cancel_proxy = self._manager.Event()
+        progress_proxy = self._manager.Value("d", 0.0)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._process_pool, fn, *args, cancel_proxy, progress_proxy)
+
+        last_progress = 0.0
+        while not future.done():
+            await asyncio.wait({future}, timeout=0.5)
+            if cancel_event is not None and cancel_event.is_set():
+                cancel_proxy.set()
+            progress = progress_proxy.value
+            if progress_callback and progress != last_progress:
+                progress_callback(progress)
+                last_progress = progress
+        return future.result()
+
+    def shutdown(self):
+        for worker in self._worker_tasks:
+            worker.cancel()
+        self._worker_tasks = []
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    def _ensure_workers(self):
+        if self._worker_tasks:
+            return
+        self._queue = asyncio.PriorityQueue()
+        for n in range(self.workers):
+            self._worker_tasks.append(asyncio.create_task(self._worker(n)))
+
+    async def _worker(self, n: int):
+        while True:
+            _, _, task_id, job = await self._queue.get()
+            if self._waiting.pop(task_id, None) is None:
+                # Discarded while waiting
+                self._queue.task_done()
+                continue
+            self._running += 1
+            try:
+                await job()
+            except Exception as e:
+                print(f"[JobScheduler] Worker {n}: job {task_id} failed: {e}")
+            finally:
+                self._running -= 1
+                self._queue.task_done()
+
+
+job_scheduler = JobScheduler(
+    workers=settings.TTS_WORKERS,
+    max_queue=settings.TTS_QUEUE_MAX_SIZE
+)
@@ -1,10 +1,33 @@
 import os
-import uuid
+import time
 import torch
 import asyncio
-import scipy.io.wavfile
-from typing import Optional, Tuple
-from qwen_tts.inference.qwen3_tts_model import Qwen3TTSModel
+import hashlib
+import threading
+import contextlib
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+from qwen_tts.inference.qwen3_tts_model import Qwen3TTSModel, VoiceClonePromptItem
+from src.config import settings
+from src.audio.chunk_cache import tts_chunk_cache
+from src.audio.generation import GenerationCancelled
+from src.audio.tts_engines import get_reference_audio
+from src.metrics import observe_tts_chunk
+
+DTYPES = {"float32": torch.float32, "bfloat16": torch.bfloat16}
+
+
+def apply_thread_settings():
+    """Apply QWEN_NUM_THREADS / QWEN_NUM_INTEROP_THREADS (process-wide torch settings)."""
+    if settings.QWEN_NUM_THREADS > 0:
+        torch.set_num_threads(settings.QWEN_NUM_THREADS)
+    if settings.QWEN_NUM_INTEROP_THREADS > 0:
+        try:
+            torch.set_num_interop_threads(settings.QWEN_NUM_INTEROP_THREADS)
+        except RuntimeError as e:
+            # Only allowed before torch has run any parallel work in this process
+            print(f"[QwenTTS] Could not set inter-op threads: {e}")
+    print(f"[QwenTTS] Threads: {torch.get_num_threads()} intra-op, {torch.get_num_interop_threads()} inter-op")
 
 class QwenTTSHandler:
     """
@@ -23,30 +46,109 @@ class QwenTTSHandler:
             return
 
         print("[QwenTTS] Initializing model...")
-        self.device = "cpu" # "mps" if torch.backends.mps.is_available() else "cpu"
-        print(f"[QwenTTS] Using device: {self.device}")
+        # Speaker embedding cache: (path, mtime, size) -> voice clone prompt
+        self._voice_prompts: Dict[Tuple[str, int, int], List[VoiceClonePromptItem]] = {}
+        self._voice_lock = threading.RLock()
+        self._voice_hashes: Dict[Tuple[str, int, int], str] = {}
+        # MPS has op compatibility issues with this model, so CPU is the default
+        self.device = settings.QWEN_DEVICE
+        self.dtype = DTYPES[settings.QWEN_DTYPE]
+        self.quantization = settings.QWEN_QUANTIZATION
+        if self.quantization == "int8" and (self.device != "cpu" or self.dtype != torch.float32):
+            print("[QwenTTS] int8 quantization needs float32 weights on CPU; using float32 on CPU")
+            self.device, self.dtype = "cpu", torch.float32
+        print(f"[QwenTTS] Using device: {self.device}, dtype: {str(self.dtype).replace('torch.', '')}, "
+              f"quantization: {self.quantization}")
+        apply_thread_settings()
         
         try:
-            # Load Qwen3-0.6B Base model
             # This will download from HF if not cached
+            self.model_id = settings.QWEN_MODEL_ID
+            start = time.perf_counter()
             self.model = Qwen3TTSModel.from_pretrained(
-                "Qwen/Qwen3-TTS-12Hz-0.6B-Base", 
-                device_map=self.device
+                self.model_id, 
+                device_map=self.device,
+                # torch_dtype: transformers before 4.56 does not know the newer dtype keyword
+                torch_dtype=self.dtype
             )
+            self._optimize_model()
             QwenTTSHandler._model = self.model
-            print("[QwenTTS] Model loaded successfully.")
+            print(f"[QwenTTS] Model loaded successfully in {time.perf_counter() - start:.1f}s.")
         except Exception as e:
             print(f"[QwenTTS] Failed to load model: {e}")
             raise e
 
-    async def generate(self, text: str, ref_audio_path: str) -> str:
+    def _optimize_model(self):
+        """Apply the int8 quantization and compilation selected in Settings."""
+        network = getattr(self.model, "model", None)
+        if not isinstance(network, torch.nn.Module):
+            if self.quantization != "none" or settings.QWEN_COMPILE:
+                print("[QwenTTS] Model exposes no torch module; skipping quantization/compilation")
+            return
+        network.eval()
+
+        if self.quantization == "int8":
+            # Weights of nn.Linear become int8; activations are quantized per batch at runtime
+            torch.ao.quantization.quantize_dynamic(network, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+            print("[QwenTTS] Applied dynamic int8 quantization to linear layers")
+
+        if settings.QWEN_COMPILE:
+            self._compile(network)
+
+    def _compile(self, network: torch.nn.Module):
+        """
+        Compile ``network.forward`` and warm it up with one short generation.
+        torch.compile is lazy: errors only surface on the first call, so the
+        warm-up runs here and the eager forward is restored if it fails, or
+        if generate_voice_clone never went through ``network.forward``.
+        """
+        ref_audio_path = get_reference_audio("Host A")
+        if not os.path.exists(ref_audio_path):
+            print(f"[QwenTTS] No reference voice to warm up torch.compile ({ref_audio_path}); running eagerly")
+            return
+
+        eager_forward = network.forward
+        calls = 0
+
+        def counting_forward(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            return compiled_forward(*args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            # Text lengths vary per chunk, so compile for dynamic shapes
+            compiled_forward = torch.compile(eager_forward, dynamic=True)
+            network.forward = counting_forward
+            voice_clone_prompt = self.get_voice_prompt(ref_audio_path)
+            with self._inference():
+                self.model.generate_voice_clone(text="안녕하세요.", voice_clone_prompt=voice_clone_prompt)
+        except Exception as e:
+            network.forward = eager_forward
+            print(f"[QwenTTS] torch.compile failed during warm-up, running eagerly: {e}")
+            return
+
+        if calls == 0:
+            network.forward = eager_forward
+            print("[QwenTTS] generate_voice_clone does not call the model's forward; torch.compile skipped")
+            return
+        network.forward = compiled_forward
+        print(f"[QwenTTS] Compiled model forward with torch.compile "
+              f"(warm-up {time.perf_counter() - start:.1f}s, {calls} forward calls)")
+
+    def _inference(self):
+        """Context for model calls: torch.inference_mode unless disabled."""
+        return torch.inference_mode() if settings.QWEN_INFERENCE_MODE else contextlib.nullcontext()
+
+    async def generate(self, text: str, ref_audio_path: str) -> Tuple[np.ndarray, int]:
         """
         Generate audio from text using the reference audio for voice cloning.
         Runs in a separate thread to avoid blocking the event loop.
+        Returns the raw PCM array and its sample rate.
         """
         return await asyncio.to_thread(self._generate_sync, text, ref_audio_path)
 
-    def _generate_sync(self, text: str, ref_audio_path: str) -> str:
+    def _generate_sync(self, text: str, ref_audio_path: str) -> Tuple[np.ndarray, int]:
         if not self.model:
             raise RuntimeError("QwenTTS model not initialized")
 
@@ -55,43 +157,236 @@ class QwenTTSHandler:
         # Qwen3 generation
         # Returns (wavs, sample_rate)
         # wavs is a list of numpy arrays (one for each input text)
-        wavs, sample_rate = self.model.generate_voice_clone(
-            text=text,
-            ref_audio=ref_audio_path,
-            x_vector_only_mode=True
-        )
+        voice_clone_prompt = self.get_voice_prompt(ref_audio_path)
+        with self._inference():
+            wavs, sample_rate = self.model.generate_voice_clone(
+                text=text,
+                voice_clone_prompt=voice_clone_prompt
+            )
 
         if not wavs:
             raise RuntimeError("No audio generated by QwenTTS")
 
-        # Save to file
-        # We need a unique filename
-        filename = f"{uuid.uuid4()}.wav"
-        output_dir = os.path.join(os.path.dirname(__file__), "../../data/audio")
-        
-        # Ensure directory exists (it should, but just in case)
-        os.makedirs(output_dir, exist_ok=True)
-        
-        output_path = os.path.join(output_dir, filename)
-        
-        # Save using scipy
         # wavs[0] is the numpy array for the first (and only) text
-        scipy.io.wavfile.write(output_path, sample_rate, wavs[0])
-        
-        print(f"[QwenTTS] Saved to: {output_path}")
-        return output_path
+        return wavs[0], sample_rate
+
+    async def generate_batch(
+        self,
+        items: List[Tuple[str, str]],
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Tuple[List[np.ndarray], int]:
+        """
+        Generate audio for many (text, ref_audio_path) pairs at once.
+        Chunks sharing a reference voice are synthesized together in batches
+        bounded by QWEN_BATCH_SIZE and QWEN_BATCH_MAX_CHARS.
+        Returns the wavs in the same order as ``items`` plus the sample rate.
+
+        ``progress_callback(done, total)`` is called as chunks complete, and
+        setting ``cancel_event`` stops before the next batch with GenerationCancelled.
+        """
+        return await asyncio.to_thread(
+            self._generate_batch_sync, items, progress_callback, cancel_event
+        )
+
+    def _generate_batch_sync(
+        self,
+        items: List[Tuple[str, str]],
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Tuple[List[np.ndarray], int]:
+        if not self.model:
+            raise RuntimeError("QwenTTS model not initialized")
+
+        results: List[Optional[np.ndarray]] = [None] * len(items)
+        sample_rate = 0
+
+        # Serve unchanged chunks from the cache, synthesize only the rest
+        keys: List[Optional[str]] = [None] * len(items)
+        pending: List[int] = []
+        for index, (text, ref_audio_path) in enumerate(items):
+            if settings.TTS_CACHE_ENABLED:
+                keys[index] = tts_chunk_cache.make_key(
+                    "qwen", self.model_id, self.voice_hash(ref_audio_path), text
+                )
+                cached = tts_chunk_cache.get(keys[index])
+                if cached is not None:
+                    results[index], sample_rate = cached
+                    continue
+            pending.append(index)
+
+        done = len(items) - len(pending)
+        if done:
+            print(f"[QwenTTS] Cache hits: {done}/{len(items)} chunks")
+        if progress_callback:
+            progress_callback(done, len(items))
+
+        batches = self.plan_batches(
+            [items[i] for i in pending], settings.QWEN_BATCH_SIZE, settings.QWEN_BATCH_MAX_CHARS
+        )
+        for n, (ref_audio_path, batch) in enumerate(batches):
+            if cancel_event is not None and cancel_event.is_set():
+                print(f"[QwenTTS] Cancelled before batch {n+1}/{len(batches)}")
+                raise GenerationCancelled("Generation cancelled")
+
+            indices = [pending[i] for i in batch]
+            texts = [items[i][0] for i in indices]
+            print(f"[QwenTTS] Batch {n+1}/{len(batches)}: {len(texts)} chunks, "
+                  f"{sum(len(t) for t in texts)} chars, ref: {os.path.basename(ref_audio_path)}")
+
+            voice_clone_prompt = self.get_voice_prompt(ref_audio_path) * len(texts)
+            start = time.perf_counter()
+            with self._inference():
+                wavs, sample_rate = self.model.generate_voice_clone(
+                    text=texts,
+                    voice_clone_prompt=voice_clone_prompt
+                )
+            elapsed = time.perf_counter() - start
+
+            if not wavs or len(wavs) != len(texts):
+                raise RuntimeError(
+                    f"QwenTTS returned {len(wavs) if wavs else 0} wavs for {len(texts)} texts"
+                )
+
+            for index, wav in zip(indices, wavs):
+                results[index] = wav
+                # A batch is one forward pass; attribute its time to chunks evenly
+                observe_tts_chunk("qwen", elapsed / len(wavs), len(wav), sample_rate)
+                if keys[index] is not None:
+                    tts_chunk_cache.put(keys[index], wav, sample_rate)
+
+            done += len(indices)
+            if progress_callback:
+                progress_callback(done, len(items))
+
+        return results, sample_rate
+
+    def get_voice_prompt(self, ref_audio_path: str) -> List[VoiceClonePromptItem]:
+        """
+        Return the voice clone prompt (speaker x-vector) for a reference file.
+
+        Prompts are cached in memory by path + mtime/size, so the reference
+        audio is loaded and its x-vector extracted once per speaker per process.
+        With QWEN_PERSIST_SPEAKER_EMBEDDINGS the embedding is also stored as
+        ``embeddings/<name>-<content hash>.npy`` next to the reference file.
+        """
+        ref_audio_path = os.path.abspath(ref_audio_path)
+        stat = os.stat(ref_audio_path)
+        key = (ref_audio_path, stat.st_mtime_ns, stat.st_size)
+
+        with self._voice_lock:
+            prompt = self._voice_prompts.get(key)
+            if prompt is not None:
+                return prompt
+
+            cache_path = None
+            if settings.QWEN_PERSIST_SPEAKER_EMBEDDINGS:
+                cache_path = self._embedding_cache_path(ref_audio_path)
+
+            if cache_path and os.path.exists(cache_path):
+                print(f"[QwenTTS] Loading cached speaker embedding: {cache_path}")
+                # Stored as float32; match the model's dtype (bf16 profiles)
+                embedding = torch.from_numpy(np.load(cache_path)).to(self.device, dtype=self.dtype)
+                prompt = [VoiceClonePromptItem(
+                    ref_code=None,
+                    ref_spk_embedding=embedding,
+                    x_vector_only_mode=True,
+                    icl_mode=False
+                )]
+            else:
+                print(f"[QwenTTS] Extracting speaker embedding: {ref_audio_path}")
+                with self._inference():
+                    prompt = self.model.create_voice_clone_prompt(
+                        ref_audio=ref_audio_path,
+                        x_vector_only_mode=True
+                    )
+                if cache_path:
+                    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                    embedding = prompt[0].ref_spk_embedding.detach().float().cpu().numpy()
+                    np.save(cache_path, embedding)
+
+            # Drop entries for older versions of the same file
+            for stale in [k for k in self._voice_prompts if k[0] == ref_audio_path]:
+                del self._voice_prompts[stale]
+            self._voice_prompts[key] = prompt
+            return prompt
+
+    def voice_hash(self, ref_audio_path: str) -> str:
+        """Content hash of a reference file, memoized by path + mtime/size."""
+        ref_audio_path = os.path.abspath(ref_audio_path)
+        stat = os.stat(ref_audio_path)
+        key = (ref_audio_path, stat.st_mtime_ns, stat.st_size)
+
+        with self._voice_lock:
+            cached = self._voice_hashes.get(key)
+        if cached is not None:
+            return cached
+
+        digest = hashlib.sha256()
+        with open(ref_audio_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        value = digest.hexdigest()
+
+        with self._voice_lock:
+            self._voice_hashes[key] = value
+        return value
+
+    def _embedding_cache_path(self, ref_audio_path: str) -> str:
+        """Path of the persisted embedding, keyed by the reference content hash."""
+        name = os.path.splitext(os.path.basename(ref_audio_path))[0]
+        return os.path.join(
+            os.path.dirname(ref_audio_path),
+            "embeddings",
+            f"{name}-{self.voice_hash(ref_audio_path)[:16]}.npy"
+        )
+
+    @staticmethod
+    def plan_batches(
+        items: List[Tuple[str, str]],
+        max_size: int,
+        max_chars: int
+    ) -> List[Tuple[str, List[int]]]:
+        """
+        Group item indices into batches of a single reference voice.
+
+        Within a voice, chunks are ordered by length so that similarly sized
+        texts share a batch (less padding), then packed greedily until either
+        ``max_size`` chunks or ``max_chars`` characters would be exceeded.
+        A single chunk longer than ``max_chars`` gets a batch of its own.
+        """
+        groups: Dict[str, List[int]] = {}
+        for index, (_, ref_audio_path) in enumerate(items):
+            groups.setdefault(ref_audio_path, []).append(index)
+
+        batches: List[Tuple[str, List[int]]] = []
+        for ref_audio_path, indices in groups.items():
+            indices.sort(key=lambda i: len(items[i][0]))
+            current: List[int] = []
+            current_chars = 0
+            for index in indices:
+                length = len(items[index][0])
+                if current and (len(current) >= max_size or current_chars + length > max_chars):
+                    batches.append((ref_audio_path, current))
+                    current, current_chars = [], 0
+                current.append(index)
+                current_chars += length
+            if current:
+                batches.append((ref_audio_path, current))
+
+        return batches
 
 if __name__ == "__main__":
     # Test run
     async def test():
         handler = QwenTTSHandler()
         # Ensure we have a reference file from the previous step
-        ref_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../data/voices/host_a.wav"))
+        ref_path = get_reference_audio("Host A")
         if not os.path.exists(ref_path):
             print(f"Reference file not found: {ref_path}")
             return
             
-        path = await handler.generate("Hello world, this is a Qwen test.", ref_path)
-        print(f"Generated file: {path}")
+        wav, sample_rate = await handler.generate("Hello world, this is a Qwen test.", ref_path)
+        print(f"Generated {len(wav) / sample_rate:.2f}s of audio at {sample_rate}Hz")
 
     asyncio.run(test())
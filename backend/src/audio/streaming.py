@@ -0,0 +1,241 @@
+import io
+import os
+import math
+import time
+import asyncio
+import subprocess
+import threading
+import numpy as np
+from typing import AsyncIterator, List, Tuple
+from pydub import AudioSegment
+from src.audio.assembler import pcm_to_int16, pcm_to_segment
+
+HLS_DIR = "./data/hls"
+PLAYLIST_NAME = "playlist.m3u8"
+
+
+def encode_mp3(pcm: np.ndarray, sample_rate: int, bitrate: str = "128k") -> bytes:
+    """Encode a float PCM buffer into a standalone MP3 byte string."""
+    buffer = io.BytesIO()
+    pcm_to_segment(pcm, sample_rate).export(buffer, format="mp3", bitrate=bitrate)
+    return buffer.getvalue()
+
+
+def decode_mp3(data: bytes) -> Tuple[np.ndarray, int]:
+    """Decode MP3 bytes into mono float PCM in [-1, 1] and its sample rate."""
+    segment = AudioSegment.from_file(io.BytesIO(data), format="mp3").set_channels(1)
+    samples = np.array(segment.get_array_of_samples(), dtype=np.float32)
+    return samples / float(1 << (8 * segment.sample_width - 1)), segment.frame_rate
+
+
+class MP3FileEncoder:
+    """
+    Incremental MP3 encoder backed by one long-lived ffmpeg process.
+
+    16-bit PCM written with ``write`` / ``write_silence`` is piped to
+    ffmpeg's stdin and encoded straight to ``path``, so memory stays at
+    roughly the size of the last write however long the episode gets.
+    ``close`` finishes the file; ``abort`` kills ffmpeg and removes it.
+    Writes block while ffmpeg catches up, so call them off the event loop.
+    ``busy_seconds`` is the time spent writing and finishing, i.e. encoding.
+    """
+
+    # Silence is written in blocks of this many samples
+    SILENCE_BLOCK = 1 << 16
+
+    def __init__(self, path: str, sample_rate: int, bitrate: str = "128k"):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.samples_written = 0
+        self.busy_seconds = 0.0
+        self._process = subprocess.Popen(
+            [
+                AudioSegment.converter, "-hide_banner", "-loglevel", "error", "-y",
+                "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0",
+                "-codec:a", "libmp3lame", "-b:a", bitrate, "-f", "mp3", path,
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+        # Drain stderr so a chatty ffmpeg can never block on a full pipe
+        self._stderr = bytearray()
+        self._stderr_thread = threading.Thread(target=self._drain_stderr, daemon=True)
+        self._stderr_thread.start()
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.samples_written / self.sample_rate
+
+    def write(self, pcm: np.ndarray):
+        """Encode float PCM in [-1, 1]."""
+        self._write(pcm_to_int16(pcm).tobytes())
+        self.samples_written += len(pcm)
+
+    def write_silence(self, samples: int):
+        block = bytes(2 * min(samples, self.SILENCE_BLOCK))
+        remaining = samples
+        while remaining > 0:
+            n = min(remaining, self.SILENCE_BLOCK)
+            self._write(block[:2 * n])
+            remaining -= n
+        self.samples_written += samples
+
+    def close(self):
+        """Flush and wait for ffmpeg; raises RuntimeError if encoding failed."""
+        if self._process.stdin and not self._process.stdin.closed:
+            try:
+                self._process.stdin.close()
+            except BrokenPipeError:
+                pass
+        start = time.perf_counter()
+        returncode = self._process.wait()
+        self._stderr_thread.join()
+        self.busy_seconds += time.perf_counter() - start
+        if returncode != 0:
+            raise RuntimeError(
+                f"ffmpeg exited with {returncode}: {self._stderr.decode(errors='replace').strip()}"
+            )
+
+    def abort(self):
+        """Stop encoding and delete the partial file."""
+        self._process.kill()
+        self._process.wait()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _write(self, data: bytes):
+        start = time.perf_counter()
+        try:
+            self._process.stdin.write(data)
+            self.busy_seconds += time.perf_counter() - start
+        except BrokenPipeError:
+            self._process.wait()
+            self._stderr_thread.join()
+            raise RuntimeError(
+                f"ffmpeg stopped during encoding: {self._stderr.decode(errors='replace').strip()}"
+            )
+
+    def _drain_stderr(self):
+        for line in self._process.stderr:
+            self._stderr.extend(line)
+
+
+async def stream_mp3(
+    lines: AsyncIterator[Tuple[np.ndarray, int]],
+    bitrate: str = "128k",
+    read_size: int = 1 << 16
+) -> AsyncIterator[bytes]:
+    """
+    Encode PCM blocks from ``lines`` into one continuous MP3 stream.
+
+    A single ffmpeg process is fed as blocks arrive and its output is yielded
+    as soon as ffmpeg emits it, so the stream has one header and no gaps
+    between lines. All blocks must share the sample rate of the first one.
+    Raises if ``lines`` or ffmpeg fails; the stream is then incomplete.
+    """
+    iterator = lines.__aiter__()
+    try:
+        pcm, sample_rate = await iterator.__anext__()
+    except StopAsyncIteration:
+        return
+
+    process = await asyncio.create_subprocess_exec(
+        AudioSegment.converter, "-hide_banner", "-loglevel", "error",
+        "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0",
+        "-codec:a", "libmp3lame", "-b:a", bitrate, "-flush_packets", "1", "-f", "mp3", "pipe:1",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+
+    async def feed():
+        block = pcm
+        try:
+            while True:
+                process.stdin.write(pcm_to_int16(block).tobytes())
+                await process.stdin.drain()
+                try:
+                    block, rate = await iterator.__anext__()
+                except StopAsyncIteration:
+                    break
+                if rate != sample_rate:
+                    raise RuntimeError(f"Sample rate changed mid-stream ({sample_rate} -> {rate})")
+        finally:
+            process.stdin.close()
+
+    feeder = asyncio.create_task(feed())
+    # Drain stderr so a chatty ffmpeg can never block on a full pipe
+    stderr = asyncio.create_task(process.stderr.read())
+    try:
+        while True:
+            data = await process.stdout.read(read_size)
+            if not data:
+                break
+            yield data
+        await feeder
+        returncode = await process.wait()
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg exited with {returncode}: {(await stderr).decode(errors='replace').strip()}")
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        feeder.cancel()
+        stderr.cancel()
+
+
+class HLSSegmentWriter:
+    """
+    Writes an episode as an HLS event playlist while it is being synthesized.
+
+    Each dialogue line becomes one MP3 segment under ``data/hls/<stream_id>/``
+    and the playlist is rewritten after every segment, so players can start
+    as soon as the first line exists. ``close`` appends ``#EXT-X-ENDLIST``;
+    call it only when every line was written, so a failed stream never looks
+    complete.
+    """
+
+    def __init__(self, stream_id: str, base_dir: str = HLS_DIR):
+        self.stream_id = stream_id
+        self.directory = os.path.join(base_dir, stream_id)
+        self.segments: List[tuple] = []  # (filename, duration)
+        self.finished = False
+        os.makedirs(self.directory, exist_ok=True)
+        self._write_playlist()
+
+    @property
+    def playlist_path(self) -> str:
+        return os.path.join(self.directory, PLAYLIST_NAME)
+
+    def add_segment(self, mp3_bytes: bytes, duration: float):
+        filename = f"segment_{len(self.segments):05d}.mp3"
+        with open(os.path.join(self.directory, filename), "wb") as f:
+            f.write(mp3_bytes)
+        self.segments.append((filename, duration))
+        self._write_playlist()
+
+    def close(self):
+        self.finished = True
+        self._write_playlist()
+
+    def _write_playlist(self):
+        target = max([math.ceil(d) for _, d in self.segments] or [1])
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            "#EXT-X-PLAYLIST-TYPE:EVENT",
+            f"#EXT-X-TARGETDURATION:{target}",
+            "#EXT-X-MEDIA-SEQUENCE:0",
+        ]
+        for filename, duration in self.segments:
+            lines.append(f"#EXTINF:{duration:.3f},")
+            lines.append(filename)
+        if self.finished:
+            lines.append("#EXT-X-ENDLIST")
+
+        # Write atomically so players never read a half-written playlist
+        tmp_path = self.playlist_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, self.playlist_path)
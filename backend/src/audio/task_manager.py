@@ -1,8 +1,11 @@
-import asyncio
 import uuid
-from typing import Dict, Optional, Callable, Any
+import asyncio
+import threading
+from typing import AsyncIterator, Dict, List, Optional, Callable, Any, Tuple
 from pydantic import BaseModel
 from datetime import datetime
+from src.config import settings
+from src.audio.task_store import TaskStore, InMemoryTaskStore, SQLiteTaskStore, FINISHED_STATUSES
 
 class TaskStatus(BaseModel):
     task_id: str
@@ -12,6 +15,7 @@ class TaskStatus(BaseModel):
     error: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    queue_position: Optional[int] = None
 
 class Task:
     def __init__(self, task_id: str):
@@ -22,15 +26,30 @@ class Task:
         self.error = None
         self.created_at = datetime.now()
         self.updated_at = datetime.now()
-        self.cancellation_event = asyncio.Event()
+        # threading.Event so synthesis threads can poll it between batches
+        self.cancellation_event = threading.Event()
+        self.store: Optional[TaskStore] = None
+        # Called after every change (possibly from a worker thread)
+        self.listener: Optional[Callable[["Task"], None]] = None
 
     def update_progress(self, progress: float):
         self.progress = progress
-        self.updated_at = datetime.now()
+        self._touch()
 
     def set_status(self, status: str):
         self.status = status
+        self._touch()
+
+    def set_result(self, result: Optional[str]):
+        self.result = result
+        self._touch()
+
+    def _touch(self):
         self.updated_at = datetime.now()
+        if self.store is not None:
+            self.store.save(self)
+        if self.listener is not None:
+            self.listener(self)
 
     def to_status_model(self) -> TaskStatus:
         return TaskStatus(
@@ -44,17 +63,97 @@ class Task:
         )
 
 class TaskManager:
-    def __init__(self):
-        self.tasks: Dict[str, Task] = {}
+    # Prune finished tasks every N task creations
+    PRUNE_INTERVAL = 100
+
+    def __init__(self, store: Optional[TaskStore] = None):
+        self.store = store or InMemoryTaskStore(
+            ttl_seconds=settings.TASK_TTL_SECONDS,
+            max_tasks=settings.TASK_MAX_TASKS
+        )
+        self._created_since_prune = 0
+        # task_id -> wake-up events of watchers, with the loop each belongs to
+        self._watchers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+        self._watchers_lock = threading.Lock()
 
     def create_task(self) -> str:
         task_id = str(uuid.uuid4())
         task = Task(task_id)
-        self.tasks[task_id] = task
+        task.store = self.store
+        task.listener = self._publish
+        self.store.save(task)
+
+        self._created_since_prune += 1
+        if self._created_since_prune >= self.PRUNE_INTERVAL:
+            self.prune()
         return task_id
 
     def get_task(self, task_id: str) -> Optional[Task]:
-        return self.tasks.get(task_id)
+        task = self.store.get(task_id)
+        if task is not None and task.listener is None:
+            task.listener = self._publish
+        return task
+
+    async def watch(
+        self,
+        task_id: str,
+        heartbeat: Optional[float] = None
+    ) -> AsyncIterator[Optional[TaskStatus]]:
+        """
+        Yield the task's status now and after every change until it finishes.
+        Bursts of updates are coalesced into the latest snapshot. With
+        ``heartbeat`` set, yields None after that many idle seconds.
+        """
+        task = self.get_task(task_id)
+        if task is None:
+            return
+
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+        watcher = (loop, changed)
+        with self._watchers_lock:
+            self._watchers.setdefault(task_id, []).append(watcher)
+
+        try:
+            while True:
+                changed.clear()
+                task = self.get_task(task_id) or task
+                status = task.to_status_model()
+                yield status
+                if status.status in FINISHED_STATUSES:
+                    return
+
+                while True:
+                    try:
+                        await asyncio.wait_for(changed.wait(), timeout=heartbeat)
+                        break
+                    except asyncio.TimeoutError:
+                        yield None
+        finally:
+            with self._watchers_lock:
+                watchers = self._watchers.get(task_id, [])
+                if watcher in watchers:
+                    watchers.remove(watcher)
+                if not watchers:
+                    self._watchers.pop(task_id, None)
+
+    def _publish(self, task: Task):
+        with self._watchers_lock:
+            watchers = list(self._watchers.get(task.task_id, ()))
+        for loop, changed in watchers:
+            try:
+                loop.call_soon_threadsafe(changed.set)
+            except RuntimeError:
+                # Watcher's loop already closed
+                pass
+
+    def list_tasks(
+        self,
+        status: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List[Task]:
+        return self.store.list(status=status, since=since, limit=limit)
 
     def cancel_task(self, task_id: str) -> bool:
         task = self.get_task(task_id)
@@ -65,7 +164,34 @@ class TaskManager:
         return False
 
     def remove_task(self, task_id: str):
-        if task_id in self.tasks:
-            del self.tasks[task_id]
+        self.store.delete(task_id)
+
+    def recover_interrupted(self) -> int:
+        """Fail tasks a previous server process left unfinished (startup only)."""
+        recovered = self.store.recover_interrupted()
+        if recovered:
+            print(f"[TaskManager] Marked {recovered} interrupted tasks as failed")
+        return recovered
+
+    def prune(self) -> int:
+        self._created_since_prune = 0
+        removed = self.store.prune()
+        if removed:
+            print(f"[TaskManager] Pruned {removed} finished tasks")
+        return removed
+
+
+def create_task_store() -> TaskStore:
+    """Build the task store selected by Settings.TASK_STORE."""
+    if settings.TASK_STORE == "sqlite":
+        return SQLiteTaskStore(
+            path=settings.TASK_STORE_PATH,
+            ttl_seconds=settings.TASK_TTL_SECONDS,
+            max_tasks=settings.TASK_MAX_TASKS
+        )
+    return InMemoryTaskStore(
+        ttl_seconds=settings.TASK_TTL_SECONDS,
+        max_tasks=settings.TASK_MAX_TASKS
+    )
 
-task_manager = TaskManager()
+task_manager = TaskManager(create_task_store())
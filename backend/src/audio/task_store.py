@@ -0,0 +1,282 @@
+import os
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from src.audio.task_manager import Task
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+
+class TaskStore(ABC):
+    """
+    Storage backend for TaskManager.
+
+    Stores hold live Task objects for the current process and are told to
+    ``save`` whenever a task changes. ``prune`` drops finished tasks older
+    than the TTL and, if the store is still over capacity, the oldest
+    finished tasks first.
+    """
+
+    def __init__(self, ttl_seconds: int, max_tasks: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_tasks = max_tasks
+
+    @abstractmethod
+    def save(self, task: "Task"):
+        ...
+
+    @abstractmethod
+    def get(self, task_id: str) -> Optional["Task"]:
+        ...
+
+    @abstractmethod
+    def delete(self, task_id: str):
+        ...
+
+    @abstractmethod
+    def list(
+        self,
+        status: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List["Task"]:
+        """Tasks filtered by status / creation time, newest first."""
+        ...
+
+    @abstractmethod
+    def prune(self) -> int:
+        """Remove expired finished tasks; returns how many were removed."""
+        ...
+
+    def recover_interrupted(self) -> int:
+        """
+        Mark tasks left pending/running by a previous server process as failed;
+        returns how many were marked. Call once at startup, before new tasks
+        are accepted. Nothing survives a restart in process-local stores.
+        """
+        return 0
+
+
+class InMemoryTaskStore(TaskStore):
+    """Process-local store with a status index and TTL/size eviction."""
+
+    def __init__(self, ttl_seconds: int, max_tasks: int):
+        super().__init__(ttl_seconds, max_tasks)
+        self._lock = threading.Lock()
+        # Insertion order == creation order, oldest first
+        self._tasks: "OrderedDict[str, Task]" = OrderedDict()
+        self._by_status: Dict[str, Set[str]] = {}
+        self._status_of: Dict[str, str] = {}
+
+    def save(self, task: "Task"):
+        with self._lock:
+            if task.task_id not in self._tasks:
+                self._tasks[task.task_id] = task
+            self._index(task.task_id, task.status)
+
+    def get(self, task_id: str) -> Optional["Task"]:
+        return self._tasks.get(task_id)
+
+    def delete(self, task_id: str):
+        with self._lock:
+            self._delete_locked(task_id)
+
+    def list(self, status=None, since=None, limit=100):
+        with self._lock:
+            if status is not None:
+                ids = self._by_status.get(status, set())
+                tasks = [self._tasks[i] for i in ids]
+                tasks.sort(key=lambda t: t.created_at, reverse=True)
+            else:
+                tasks = list(reversed(self._tasks.values()))
+        if since is not None:
+            tasks = [t for t in tasks if t.created_at >= since]
+        return tasks[:limit]
+
+    def prune(self) -> int:
+        cutoff = datetime.now() - timedelta(seconds=self.ttl_seconds)
+        removed = 0
+        with self._lock:
+            finished = [
+                t for t in self._tasks.values() if t.status in FINISHED_STATUSES
+            ]
+            excess = len(self._tasks) - self.max_tasks
+            for task in finished:
+                if task.updated_at < cutoff or excess > 0:
+                    self._delete_locked(task.task_id)
+                    excess -= 1
+                    removed += 1
+        return removed
+
+    def _index(self, task_id: str, status: str):
+        previous = self._status_of.get(task_id)
+        if previous == status:
+            return
+        if previous is not None:
+            self._by_status[previous].discard(task_id)
+        self._by_status.setdefault(status, set()).add(task_id)
+        self._status_of[task_id] = status
+
+    def _delete_locked(self, task_id: str):
+        if self._tasks.pop(task_id, None) is None:
+            return
+        status = self._status_of.pop(task_id, None)
+        if status is not None:
+            self._by_status[status].discard(task_id)
+
+
+class SQLiteTaskStore(TaskStore):
+    """
+    Durable store backed by SQLite, indexed by status and created_at.
+
+    Tasks created by this process stay cached as live objects (they carry the
+    cancellation event); tasks from earlier runs are rebuilt from their rows.
+    Like the status push, progress ticks are coalesced: a save that only
+    changes progress is written at most every ``PROGRESS_WRITE_INTERVAL``
+    seconds, while status, result and error changes are written at once
+    (with the latest progress).
+    Opening the store has no effect on existing rows; ``recover_interrupted``
+    marks tasks left pending/running by a previous process as failed.
+    """
+
+    PROGRESS_WRITE_INTERVAL = 1.0
+
+    def __init__(self, path: str, ttl_seconds: int, max_tasks: int):
+        super().__init__(ttl_seconds, max_tasks)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._live: Dict[str, "Task"] = {}
+        # task_id -> (status, result, error) of the last written row and when it was written
+        self._written: Dict[str, Tuple[tuple, float]] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS tasks (
+                    task_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    progress REAL NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status, created_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks(created_at)")
+
+    def recover_interrupted(self) -> int:
+        with self._lock:
+            with self._conn:
+                return self._conn.execute(
+                    "UPDATE tasks SET status = 'failed', error = 'Interrupted by server restart', updated_at = ? "
+                    "WHERE status IN ('pending', 'running')",
+                    (datetime.now().isoformat(),)
+                ).rowcount
+
+    def save(self, task: "Task"):
+        state = (task.status, task.result, task.error)
+        now = time.monotonic()
+        with self._lock:
+            self._live[task.task_id] = task
+            written = self._written.get(task.task_id)
+            if written is not None and written[0] == state and now - written[1] < self.PROGRESS_WRITE_INTERVAL:
+                # Progress only; readers in this process get it from the live object
+                return
+            self._written[task.task_id] = (state, now)
+            with self._conn:
+                self._conn.execute(
+                    """
+                    INSERT INTO tasks (task_id, status, progress, result, error, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(task_id) DO UPDATE SET
+                        status = excluded.status,
+                        progress = excluded.progress,
+                        result = excluded.result,
+                        error = excluded.error,
+                        updated_at = excluded.updated_at
+                    """,
+                    (
+                        task.task_id, task.status, task.progress, task.result, task.error,
+                        task.created_at.isoformat(), task.updated_at.isoformat()
+                    )
+                )
+
+    def get(self, task_id: str) -> Optional["Task"]:
+        task = self._live.get(task_id)
+        if task is not None:
+            return task
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return self._from_row(row) if row else None
+
+    def delete(self, task_id: str):
+        with self._lock:
+            self._live.pop(task_id, None)
+            self._written.pop(task_id, None)
+            with self._conn:
+                self._conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+
+    def list(self, status=None, since=None, limit=100):
+        query = "SELECT * FROM tasks"
+        clauses, params = [], []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since.isoformat())
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._live.get(row["task_id"]) or self._from_row(row) for row in rows]
+
+    def prune(self) -> int:
+        cutoff = (datetime.now() - timedelta(seconds=self.ttl_seconds)).isoformat()
+        placeholders = ", ".join("?" for _ in FINISHED_STATUSES)
+        with self._lock:
+            with self._conn:
+                removed = self._conn.execute(
+                    f"DELETE FROM tasks WHERE status IN ({placeholders}) AND updated_at < ?",
+                    (*FINISHED_STATUSES, cutoff)
+                ).rowcount
+                total = self._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+                if total > self.max_tasks:
+                    removed += self._conn.execute(
+                        f"""
+                        DELETE FROM tasks WHERE task_id IN (
+                            SELECT task_id FROM tasks WHERE status IN ({placeholders})
+                            ORDER BY created_at LIMIT ?
+                        )
+                        """,
+                        (*FINISHED_STATUSES, total - self.max_tasks)
+                    ).rowcount
+            # Forget live objects of finished tasks; they can be rebuilt from rows
+            for task_id in [i for i, t in self._live.items() if t.status in FINISHED_STATUSES]:
+                del self._live[task_id]
+                self._written.pop(task_id, None)
+        return removed
+
+    def _from_row(self, row: sqlite3.Row) -> "Task":
+        from src.audio.task_manager import Task
+        task = Task(row["task_id"])
+        task.status = row["status"]
+        task.progress = row["progress"]
+        task.result = row["result"]
+        task.error = row["error"]
+        task.created_at = datetime.fromisoformat(row["created_at"])
+        task.updated_at = datetime.fromisoformat(row["updated_at"])
+        task.store = self
+        return task
@@ -0,0 +1,274 @@
+import re
+import math
+import threading
+from typing import Dict, List, Tuple
+from src.config import settings
+
+# Sentence-final punctuation, including the ellipsis and full-width forms
+TERMINATORS = ".?!…。？！"
+# Quote/bracket pairs; a sentence never ends inside one
+QUOTE_PAIRS = {"“": "”", "‘": "’", "「": "」", "『": "』", "(": ")", "（": "）", "[": "]"}
+CLOSERS = set(QUOTE_PAIRS.values())
+STRAIGHT_QUOTES = "\"'"
+
+ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "st", "vs", "etc", "e.g", "i.e", "no",
+    "inc", "ltd", "co", "corp", "jr", "sr", "u.s", "u.k", "fig", "vol", "approx",
+}
+
+_URL = re.compile(r"(?:https?://|www\.)[^\s\"'”’<>]+[^\s\"'”’<>.,!?…)\]]", re.IGNORECASE)
+# Quotative particles after a closing quote: '"안녕." 라고 했다' is one sentence
+_QUOTATIVE = re.compile(r"\s*(?:이?라고|하고|고|이?라며|하며|이?라는|하는)(?=\s|[.,!?]|$)")
+# Sentence-final endings, used to split long sentences that lack punctuation
+_KOREAN_ENDING = re.compile(r"(?<=[가-힣])(?:습니다|니다|어요|아요|에요|예요|해요|네요|군요|까요|죠|다)(?=\s)")
+# Clause punctuation followed by a space (so 1,000 and 3:30 stay intact)
+_CLAUSE_BREAK = re.compile(r"[,;:、，](?=\s)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _url_spans(text: str) -> List[Tuple[int, int]]:
+    return [m.span() for m in _URL.finditer(text)]
+
+
+def _in_spans(pos: int, spans: List[Tuple[int, int]]) -> bool:
+    return any(start <= pos < end for start, end in spans)
+
+
+def _is_abbreviation(text: str, dot: int) -> bool:
+    """Whether the period at ``dot`` ends an abbreviation or an initial (Dr., e.g., J.)."""
+    start = dot
+    while start > 0 and (text[start - 1].isalpha() or text[start - 1] == "."):
+        start -= 1
+    word = text[start:dot]
+    if not word or not word.isascii():
+        return False
+    return word.lower() in ABBREVIATIONS or (len(word) == 1 and word.isupper())
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences.
+
+    A sentence ends at terminal punctuation (plus any closing quotes or
+    brackets) followed by whitespace or the end of the text. Periods inside
+    numbers, URLs, abbreviations and list markers ("1. ") do not end a
+    sentence, nor does punctuation inside quotes or before a quotative
+    particle ("...라고").
+    """
+    text = text.strip()
+    if not text:
+        return []
+
+    urls = _url_spans(text)
+    sentences = []
+    start = 0
+    stack: List[str] = []  # open quotes/brackets
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if _in_spans(i, urls):
+            i += 1
+            continue
+        if ch in QUOTE_PAIRS:
+            stack.append(QUOTE_PAIRS[ch])
+        elif ch in CLOSERS:
+            if ch in stack:
+                while stack and stack.pop() != ch:
+                    pass
+        elif ch in STRAIGHT_QUOTES:
+            # Straight quotes toggle; an apostrophe inside a word is not a quote
+            if stack and stack[-1] == ch:
+                stack.pop()
+            elif ch == '"' or not (0 < i < len(text) - 1 and text[i - 1].isalnum() and text[i + 1].isalnum()):
+                stack.append(ch)
+        elif ch in TERMINATORS and not stack:
+            end = i + 1
+            while end < len(text) and text[end] in TERMINATORS:
+                end += 1
+            if end < len(text) and not text[end].isspace():
+                i = end
+                continue
+            if ch == "." and end == i + 1 and (
+                _is_abbreviation(text, i) or text[start:i].strip().isdigit()
+            ):
+                i = end
+                continue
+            sentences.append(text[start:end].strip())
+            start = end
+            i = end
+            continue
+        elif ch in TERMINATORS and len(stack) == 1:
+            # Punctuation right before the closing quote ends the quoted sentence
+            end = i + 1
+            while end < len(text) and text[end] in TERMINATORS:
+                end += 1
+            if end < len(text) and text[end] == stack[-1] and (
+                end + 1 == len(text) or text[end + 1].isspace()
+            ) and not _QUOTATIVE.match(text, end + 1):
+                stack.pop()
+                sentences.append(text[start:end + 1].strip())
+                start = end + 1
+                i = end + 1
+                continue
+        i += 1
+
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return [s for s in sentences if s]
+
+
+def _cut(text: str, positions: List[int]) -> List[str]:
+    pieces = []
+    start = 0
+    for pos in positions:
+        pieces.append(text[start:pos].strip())
+        start = pos
+    pieces.append(text[start:].strip())
+    return [p for p in pieces if p]
+
+
+def split_long_sentence(sentence: str, max_length: int) -> List[str]:
+    """
+    Break a sentence longer than ``max_length`` into pieces that fit.
+    Tries Korean sentence endings, then clause punctuation, then spaces; a
+    word longer than ``max_length`` is cut evenly unless it is a URL.
+    """
+    if len(sentence) <= max_length:
+        return [sentence]
+
+    urls = _url_spans(sentence)
+    for pattern in (_KOREAN_ENDING, _CLAUSE_BREAK, _WHITESPACE):
+        positions = [
+            m.end() if pattern is not _WHITESPACE else m.start()
+            for m in pattern.finditer(sentence)
+            if not _in_spans(m.start(), urls)
+        ]
+        if positions:
+            pieces = []
+            for piece in _cut(sentence, positions):
+                pieces.extend(split_long_sentence(piece, max_length))
+            return pieces
+
+    if urls:
+        return [sentence]
+    parts = math.ceil(len(sentence) / max_length)
+    size = math.ceil(len(sentence) / parts)
+    return [sentence[i:i + size] for i in range(0, len(sentence), size)]
+
+
+def pack_balanced(pieces: List[str], target_length: int, max_length: int) -> List[str]:
+    """
+    Join consecutive pieces into chunks as close to ``target_length`` as
+    possible without exceeding ``max_length``.
+    Minimizes the summed squared deviation from the target over all chunks,
+    so short sentences ("네.") are merged into a neighbour instead of
+    becoming a chunk of their own and long lines split into even parts.
+    """
+    n = len(pieces)
+    if n <= 1:
+        return list(pieces)
+
+    lengths = [len(p) for p in pieces]
+    best = [0.0] + [math.inf] * n
+    prev = [0] * (n + 1)
+    for j in range(1, n + 1):
+        length = -1
+        for i in range(j - 1, -1, -1):
+            length += lengths[i] + 1
+            if length > max_length and i < j - 1:
+                break
+            cost = best[i] + (length - target_length) ** 2
+            if cost < best[j]:
+                best[j] = cost
+                prev[j] = i
+
+    chunks = []
+    j = n
+    while j > 0:
+        i = prev[j]
+        chunks.append(" ".join(pieces[i:j]))
+        j = i
+    return chunks[::-1]
+
+
+def chunk_length_stats(chunks: List[str]) -> Dict[str, float]:
+    """Count, mean, spread and percentiles of chunk lengths in characters."""
+    lengths = sorted(len(c) for c in chunks)
+    if not lengths:
+        return {"count": 0, "mean": 0.0, "stdev": 0.0, "min": 0, "p50": 0, "p95": 0, "max": 0}
+    mean = sum(lengths) / len(lengths)
+    return {
+        "count": len(lengths),
+        "mean": mean,
+        "stdev": math.sqrt(sum((l - mean) ** 2 for l in lengths) / len(lengths)),
+        "min": lengths[0],
+        "p50": lengths[len(lengths) // 2],
+        "p95": lengths[min(len(lengths) - 1, int(len(lengths) * 0.95))],
+        "max": lengths[-1],
+    }
+
+
+class TextChunker:
+    """
+    Splits dialogue lines into TTS chunks of balanced length.
+
+    Lines are segmented into sentences, overlong sentences are broken at
+    the best available boundary, and the pieces are packed toward
+    ``target_length`` (never above ``max_length``). Even chunk lengths keep
+    batch padding and per-request overhead low. Lengths of every chunk
+    produced are tracked for ``stats()``.
+    """
+
+    def __init__(self, target_length: int, max_length: int):
+        self.target_length = min(target_length, max_length)
+        self.max_length = max_length
+        self._lock = threading.Lock()
+        self._count = 0
+        self._total = 0
+        self._total_sq = 0
+        self._min = 0
+        self._max = 0
+        self._short = 0
+
+    def split(self, text: str) -> List[str]:
+        pieces = []
+        for sentence in split_sentences(text):
+            pieces.extend(split_long_sentence(sentence, self.max_length))
+        chunks = pack_balanced(pieces, self.target_length, self.max_length)
+        self._record(chunks)
+        return chunks
+
+    def _record(self, chunks: List[str]):
+        with self._lock:
+            for chunk in chunks:
+                length = len(chunk)
+                self._min = length if not self._count else min(self._min, length)
+                self._max = max(self._max, length)
+                self._count += 1
+                self._total += length
+                self._total_sq += length * length
+                if length < self.target_length // 4:
+                    self._short += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Length statistics (characters) of all chunks produced since startup."""
+        with self._lock:
+            mean = self._total / self._count if self._count else 0.0
+            variance = self._total_sq / self._count - mean * mean if self._count else 0.0
+            return {
+                "chunks": self._count,
+                "mean_length": mean,
+                "stdev_length": math.sqrt(max(variance, 0.0)),
+                "min_length": self._min,
+                "max_length": self._max,
+                "short_chunks": self._short,
+                "target_length": self.target_length,
+                "max_allowed": self.max_length,
+            }
+
+
+text_chunker = TextChunker(
+    target_length=settings.TTS_CHUNK_TARGET_CHARS,
+    max_length=settings.TTS_CHUNK_MAX_CHARS
+)
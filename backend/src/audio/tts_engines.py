@@ -0,0 +1,308 @@
+import os
+import time
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+from src.config import settings
+from src.audio.chunk_cache import tts_chunk_cache
+from src.audio.engine_loader import get_qwen_handler
+from src.audio.generation import GenerationCancelled
+from src.metrics import observe_tts_chunk
+
+VOICES_DIR = os.path.join(os.path.dirname(__file__), "../../data/voices")
+
+# Request aliases -> registry names
+ENGINE_ALIASES = {"edge-tts": "edge"}
+
+
+def is_second_host(speaker_name: str) -> bool:
+    """Scripts use Host A/Host B (Person1/Person2); everything else is voiced as Host A."""
+    return "Host B" in speaker_name or "Person2" in speaker_name
+
+
+def get_reference_audio(speaker_name: str) -> str:
+    """Get the reference audio path for a given speaker."""
+    # Default mapping based on generated references
+    if is_second_host(speaker_name):
+        return os.path.abspath(os.path.join(VOICES_DIR, "host_b.wav"))
+    return os.path.abspath(os.path.join(VOICES_DIR, "host_a.wav"))
+
+
+def pcm16_to_float(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+class RateLimiter:
+    """Spaces calls evenly so that at most ``per_minute`` start in any minute."""
+
+    def __init__(self, per_minute: int):
+        self.interval = 60.0 / per_minute
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    async def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class TTSEngine(ABC):
+    """
+    A text-to-speech backend the line-level synthesis driver can use.
+
+    Engines declare how they want to be driven: ``supports_batch`` engines get
+    all chunks at once (``synthesize_batch``); the others get one request per
+    chunk, run ``max_concurrency`` at a time under an optional per-minute rate
+    limit, with results cached in the TTS chunk cache. ``cpu_bound`` engines
+    may be moved to the worker process pool.
+    """
+
+    name: str = ""
+    model_id: str = ""
+    supports_batch: bool = False
+    cpu_bound: bool = False
+
+    def __init__(self, max_concurrency: int = 1, rate_limit: int = 0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit > 0 else None
+        # Semaphores belong to one event loop; process workers run a new loop per job
+        self._semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+
+    @property
+    def window_size(self) -> int:
+        """Chunks worth requesting together when lines are synthesized incrementally."""
+        return self.max_concurrency
+
+    @abstractmethod
+    def voice_for(self, speaker: str) -> str:
+        """Voice identifier (voice name, ID or reference file) for a script speaker."""
+        ...
+
+    async def synthesize(self, text: str, voice: str) -> Tuple[np.ndarray, int]:
+        """Synthesize one chunk; returns (float PCM, sample rate)."""
+        raise NotImplementedError(f"{self.name} only synthesizes in batches")
+
+    async def synthesize_batch(
+        self,
+        items: List[Tuple[str, str]],
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Tuple[List[np.ndarray], int]:
+        """
+        Synthesize (text, voice) items, preserving order.
+        ``progress_callback(done, total)`` is called as chunks complete and a
+        set ``cancel_event`` raises GenerationCancelled before the next request.
+        """
+        results: List[Optional[np.ndarray]] = [None] * len(items)
+        rates: List[int] = []
+        done = 0
+        semaphore = self._semaphore()
+
+        def check_cancelled():
+            if cancel_event is not None and cancel_event.is_set():
+                raise GenerationCancelled("Generation cancelled")
+
+        async def run(index: int, text: str, voice: str):
+            nonlocal done
+            key = None
+            cached = None
+            if settings.TTS_CACHE_ENABLED:
+                key = tts_chunk_cache.make_key(self.name, self.model_id, voice, text)
+                cached = tts_chunk_cache.get(key)
+            if cached is None:
+                async with semaphore:
+                    check_cancelled()
+                    if self.rate_limiter is not None:
+                        await self.rate_limiter.acquire()
+                    start = time.perf_counter()
+                    pcm, sample_rate = await self.synthesize(text, voice)
+                    observe_tts_chunk(self.name, time.perf_counter() - start, len(pcm), sample_rate)
+                if key is not None:
+                    tts_chunk_cache.put(key, pcm, sample_rate)
+            else:
+                pcm, sample_rate = cached
+            results[index] = pcm
+            rates.append(sample_rate)
+            done += 1
+            if progress_callback:
+                progress_callback(done, len(items))
+
+        tasks = [asyncio.create_task(run(i, text, voice)) for i, (text, voice) in enumerate(items)]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        if len(set(rates)) > 1:
+            raise RuntimeError(f"{self.name} returned mixed sample rates: {sorted(set(rates))}")
+        return results, rates[0] if rates else 0
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            # Forget semaphores of finished loops
+            self._semaphores = {l: s for l, s in self._semaphores.items() if not l.is_closed()}
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+
+class QwenEngine(TTSEngine):
+    """Local Qwen3-TTS voice cloning; batched, CPU/GPU bound, one job at a time."""
+
+    name = "qwen"
+    supports_batch = True
+    cpu_bound = True
+
+    @property
+    def model_id(self) -> str:
+        return settings.QWEN_MODEL_ID
+
+    @property
+    def window_size(self) -> int:
+        return settings.QWEN_BATCH_SIZE
+
+    def voice_for(self, speaker: str) -> str:
+        return get_reference_audio(speaker)
+
+    async def synthesize(self, text: str, voice: str) -> Tuple[np.ndarray, int]:
+        handler = await asyncio.to_thread(get_qwen_handler)
+        return await handler.generate(text, voice)
+
+    async def synthesize_batch(self, items, progress_callback=None, cancel_event=None):
+        handler = await asyncio.to_thread(get_qwen_handler)
+        return await handler.generate_batch(items, progress_callback, cancel_event)
+
+
+class EdgeEngine(TTSEngine):
+    """Microsoft Edge online voices; network bound, so many chunks run at once."""
+
+    name = "edge"
+    model_id = "edge-tts"
+    # Same voices Podcastfy used for this app (conversation_config)
+    VOICES = ("ko-KR-InJoonNeural", "ko-KR-SunHiNeural")
+
+    def voice_for(self, speaker: str) -> str:
+        return self.VOICES[is_second_host(speaker)]
+
+    async def synthesize(self, text: str, voice: str) -> Tuple[np.ndarray, int]:
+        import edge_tts
+        from src.audio.streaming import decode_mp3
+
+        audio = bytearray()
+        async for chunk in edge_tts.Communicate(text, voice).stream():
+            if chunk["type"] == "audio":
+                audio.extend(chunk["data"])
+        if not audio:
+            raise RuntimeError(f"Edge TTS returned no audio for: {text[:30]}...")
+        return await asyncio.to_thread(decode_mp3, bytes(audio))
+
+
+class HTTPTTSEngine(TTSEngine):
+    """Base for hosted TTS APIs called over a pooled HTTP client."""
+
+    SAMPLE_RATE = 24000
+
+    def __init__(self, max_concurrency: int = 1, rate_limit: int = 0):
+        super().__init__(max_concurrency, rate_limit)
+        self._clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            self._clients = {l: c for l, c in self._clients.items() if not l.is_closed()}
+            client = self._clients[loop] = httpx.AsyncClient(
+                timeout=httpx.Timeout(60.0),
+                limits=httpx.Limits(max_connections=self.max_concurrency)
+            )
+        return client
+
+    async def aclose(self):
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients = {}
+
+
+class OpenAIEngine(HTTPTTSEngine):
+    """OpenAI speech API, requesting raw 24 kHz PCM."""
+
+    name = "openai"
+    model_id = "tts-1-hd"
+    VOICES = ("echo", "shimmer")
+
+    def voice_for(self, speaker: str) -> str:
+        return self.VOICES[is_second_host(speaker)]
+
+    async def synthesize(self, text: str, voice: str) -> Tuple[np.ndarray, int]:
+        if not settings.OPENAI_API_KEY:
+            raise RuntimeError("OPENAI_API_KEY is not configured")
+        response = await self.client().post(
+            "https://api.openai.com/v1/audio/speech",
+            headers={"Authorization": f"Bearer {settings.OPENAI_API_KEY}"},
+            json={"model": self.model_id, "voice": voice, "input": text, "response_format": "pcm"}
+        )
+        response.raise_for_status()
+        return pcm16_to_float(response.content), self.SAMPLE_RATE
+
+
+class ElevenLabsEngine(HTTPTTSEngine):
+    """ElevenLabs text-to-speech API, requesting raw 24 kHz PCM."""
+
+    name = "elevenlabs"
+    model_id = "eleven_multilingual_v2"
+    # Premade "Chris" and "Jessica" voices (Podcastfy's defaults)
+    VOICES = ("iP95p4xoKVk53GoZ742B", "cgSgspJ2msm6clMCkdW9")
+
+    def voice_for(self, speaker: str) -> str:
+        return self.VOICES[is_second_host(speaker)]
+
+    async def synthesize(self, text: str, voice: str) -> Tuple[np.ndarray, int]:
+        if not settings.ELEVENLABS_API_KEY:
+            raise RuntimeError("ELEVENLABS_API_KEY is not configured")
+        response = await self.client().post(
+            f"https://api.elevenlabs.io/v1/text-to-speech/{voice}",
+            params={"output_format": f"pcm_{self.SAMPLE_RATE}"},
+            headers={"xi-api-key": settings.ELEVENLABS_API_KEY},
+            json={"text": text, "model_id": self.model_id}
+        )
+        response.raise_for_status()
+        return pcm16_to_float(response.content), self.SAMPLE_RATE
+
+
+_engines: Dict[str, TTSEngine] = {}
+
+
+def register_engine(engine: TTSEngine):
+    _engines[engine.name] = engine
+
+
+def get_engine(name: Optional[str] = None) -> TTSEngine:
+    """Engine by request name (``edge-tts`` is accepted for ``edge``); defaults to Settings.TTS_ENGINE."""
+    name = name or settings.TTS_ENGINE
+    engine = _engines.get(ENGINE_ALIASES.get(name, name))
+    if engine is None:
+        raise ValueError(f"Unknown TTS engine: {name} (available: {', '.join(sorted(_engines))})")
+    return engine
+
+
+async def close_engines():
+    """Close the HTTP clients of hosted engines (application shutdown)."""
+    for engine in _engines.values():
+        if isinstance(engine, HTTPTTSEngine):
+            await engine.aclose()
+
+
+register_engine(QwenEngine())
+register_engine(EdgeEngine(settings.EDGE_TTS_CONCURRENCY, settings.EDGE_TTS_RATE_LIMIT))
+register_engine(OpenAIEngine(settings.OPENAI_TTS_CONCURRENCY, settings.OPENAI_TTS_RATE_LIMIT))
+register_engine(ElevenLabsEngine(settings.ELEVENLABS_TTS_CONCURRENCY, settings.ELEVENLABS_TTS_RATE_LIMIT))
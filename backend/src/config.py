@@ -11,10 +11,22 @@ class Settings(BaseSettings):
     # API Keys & External Services
     GEMINI_API_KEY: str = Field("TODO", description="Google Gemini API Key")
     JINA_API_KEY: str | None = Field(None, description="Jina AI API Key (required for Podcastfy web scraping)")
+    OPENAI_API_KEY: str | None = Field(None, description="OpenAI API Key (openai TTS engine)")
+    ELEVENLABS_API_KEY: str | None = Field(None, description="ElevenLabs API Key (elevenlabs TTS engine)")
     
     # Supabase (Optional - for cloud storage)
     SUPABASE_URL: str = Field("", description="Supabase Project URL")
     SUPABASE_KEY: str = Field("", description="Supabase anon/public key")
+    STORAGE_UPLOAD_RETRIES: int = Field(default=3, description="Retries per upload request on transient errors")
+    STORAGE_UPLOAD_BACKOFF_SECONDS: float = Field(default=1.0, description="Initial retry delay, doubled on every retry")
+    STORAGE_UPLOAD_TIMEOUT_SECONDS: float = Field(default=60.0, description="Timeout per upload request")
+    STORAGE_MAX_CONNECTIONS: int = Field(default=10, description="Max pooled connections to Supabase Storage")
+    STORAGE_RESUMABLE_THRESHOLD_MB: int = Field(default=6, description="Files larger than this use chunked resumable upload")
+    STORAGE_BACKGROUND_UPLOAD: bool = Field(
+        default=False,
+        description="Return the local file right away and upload to Supabase in the background"
+    )
+    STORAGE_DELETE_BATCH_SIZE: int = Field(default=100, description="Files removed per Supabase remove() call")
     
     # Paths
     DATA_DIR: str = "data"
@@ -29,6 +41,100 @@ class Settings(BaseSettings):
         default="Qwen/Qwen3-TTS-12Hz-0.6B-Base",
         description="Qwen Model ID for local TTS"
     )
+    QWEN_WARMUP_ON_STARTUP: bool = Field(
+        default=False,
+        description="Load the Qwen model in the background at startup instead of on first use"
+    )
+    QWEN_BATCH_SIZE: int = Field(
+        default=8,
+        description="Max number of chunks synthesized in one Qwen batch"
+    )
+    QWEN_BATCH_MAX_CHARS: int = Field(
+        default=600,
+        description="Max total characters of the chunks in one Qwen batch"
+    )
+    QWEN_PERSIST_SPEAKER_EMBEDDINGS: bool = Field(
+        default=True,
+        description="Persist reference speaker embeddings as .npy under data/voices/embeddings"
+    )
+
+    # Qwen inference profile (0 threads = torch default)
+    QWEN_DEVICE: str = Field(default="cpu", description="Torch device for the Qwen model (cpu, cuda, mps)")
+    QWEN_NUM_THREADS: int = Field(default=0, description="Intra-op threads used by torch for Qwen inference")
+    QWEN_NUM_INTEROP_THREADS: int = Field(default=0, description="Inter-op threads used by torch for Qwen inference")
+    QWEN_INFERENCE_MODE: bool = Field(default=True, description="Run Qwen inference under torch.inference_mode")
+    QWEN_DTYPE: Literal["float32", "bfloat16"] = Field(default="float32", description="Qwen weight dtype")
+    QWEN_QUANTIZATION: Literal["none", "int8"] = Field(
+        default="none",
+        description="Dynamic int8 quantization of the Qwen linear layers (CPU, float32 only)"
+    )
+    QWEN_COMPILE: bool = Field(default=False, description="Compile the Qwen model with torch.compile, checked by a warm-up generation at load")
+
+    # Line-level TTS engines (0 = no rate limit)
+    EDGE_TTS_CONCURRENCY: int = Field(default=8, description="Edge TTS chunks synthesized at once")
+    EDGE_TTS_RATE_LIMIT: int = Field(default=0, description="Max Edge TTS requests per minute")
+    OPENAI_TTS_CONCURRENCY: int = Field(default=4, description="OpenAI TTS requests at once")
+    OPENAI_TTS_RATE_LIMIT: int = Field(default=50, description="Max OpenAI TTS requests per minute")
+    ELEVENLABS_TTS_CONCURRENCY: int = Field(default=2, description="ElevenLabs TTS requests at once")
+    ELEVENLABS_TTS_RATE_LIMIT: int = Field(default=0, description="Max ElevenLabs TTS requests per minute")
+    TTS_WINDOW_CHUNKS: int = Field(
+        default=64,
+        description="Chunks synthesized per window before their audio is encoded (bounds episode memory)"
+    )
+    MP3_BITRATE: str = Field(default="128k", description="Bitrate of exported episode MP3s")
+
+    # TTS job scheduling
+    TTS_WORKERS: int = Field(default=1, description="Max async TTS jobs running at once")
+    TTS_QUEUE_MAX_SIZE: int = Field(default=20, description="Max async TTS jobs waiting before 429")
+    TTS_EXECUTOR: Literal["thread", "process"] = Field(
+        default="thread",
+        description="Run async Qwen jobs in the web process (thread) or in a worker process pool"
+    )
+
+    # Async task store
+    TASK_STORE: Literal["memory", "sqlite"] = Field(default="memory", description="Backend for async task state")
+    TASK_STORE_PATH: str = Field(default="data/tasks.db", description="SQLite file for TASK_STORE=sqlite")
+    TASK_TTL_SECONDS: int = Field(default=86400, description="How long finished tasks are kept")
+    TASK_MAX_TASKS: int = Field(default=10000, description="Max tasks kept before the oldest finished ones are evicted")
+
+    # Concurrent source ingestion ahead of script generation
+    INGEST_ENABLED: bool = Field(default=True, description="Prefetch all sources concurrently before Podcastfy runs (needs SOURCE_CACHE_ENABLED)")
+    INGEST_TIMEOUT_SECONDS: float = Field(default=20.0, description="Timeout per source fetch")
+    INGEST_PER_HOST_LIMIT: int = Field(default=2, description="Max concurrent fetches per host")
+    INGEST_MAX_CONNECTIONS: int = Field(default=20, description="Max pooled connections for source fetching")
+
+    # Source extraction cache (stored under DATA_DIR/cache/sources)
+    SOURCE_CACHE_ENABLED: bool = Field(default=True, description="Reuse extracted source text across requests")
+    SOURCE_CACHE_TTL_SECONDS: int = Field(default=3600, description="Serve cached text without revalidation for this long")
+    SOURCE_CACHE_MAX_MB: int = Field(default=256, description="Max size of the source cache on disk")
+
+    # Script cache (stored under DATA_DIR/cache/scripts)
+    SCRIPT_CACHE_ENABLED: bool = Field(default=True, description="Reuse scripts generated from identical sources")
+    SCRIPT_CACHE_MAX_ENTRIES: int = Field(default=500, description="Max number of cached scripts")
+
+    # Episode catalog
+    EPISODE_INDEX_PATH: str = Field(default="data/episodes.db", description="SQLite index of generated episodes")
+
+    # Episode retention (0 disables a limit)
+    RETENTION_ENABLED: bool = Field(default=False, description="Periodically delete expired episodes")
+    RETENTION_MAX_AGE_DAYS: int = Field(default=30, description="Delete episodes older than this many days")
+    RETENTION_MAX_TOTAL_MB: int = Field(default=0, description="Delete the oldest episodes while the archive is larger than this")
+    RETENTION_INTERVAL_SECONDS: int = Field(default=3600, description="How often the retention job runs")
+    RETENTION_HLS_MAX_AGE_HOURS: int = Field(default=24, description="Delete HLS stream directories not written to for this many hours")
+
+    # Streaming script generation
+    SCRIPT_STREAMING_ENABLED: bool = Field(
+        default=False,
+        description="Generate scripts with a streaming Gemini call and synthesize lines as they arrive"
+    )
+
+    # TTS text chunking
+    TTS_CHUNK_TARGET_CHARS: int = Field(default=100, description="Length TTS chunks are balanced toward")
+    TTS_CHUNK_MAX_CHARS: int = Field(default=150, description="Max length of a TTS chunk (unless it is a single URL)")
+
+    # TTS chunk cache (content-addressed, stored under DATA_DIR/cache/tts)
+    TTS_CACHE_ENABLED: bool = Field(default=True, description="Reuse synthesized audio for unchanged chunks")
+    TTS_CACHE_MAX_MB: int = Field(default=1024, description="Max size of the TTS chunk cache on disk")
 
     class Config:
         env_file = ".env"
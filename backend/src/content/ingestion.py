@@ -0,0 +1,181 @@
+import asyncio
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from src.config import settings
+from src.models import ContentSource
+from src.content.source_cache import source_cache, conditional_headers, response_validators
+from src.metrics import SOURCE_FETCH_SECONDS
+
+JINA_READER_URL = "https://r.jina.ai/"
+
+
+def _html_to_text(html: str) -> str:
+    """Readable text of an HTML page (scripts, styles and navigation removed)."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript", "nav", "header", "footer", "aside"]):
+        tag.decompose()
+    root = soup.find("article") or soup.find("main") or soup.body or soup
+    lines = (line.strip() for line in root.get_text("\n").splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _feed_to_text(content: bytes) -> str:
+    """Titles and summaries of the entries of an RSS/Atom feed."""
+    import feedparser
+
+    feed = feedparser.parse(content)
+    parts = []
+    if feed.feed.get("title"):
+        parts.append(feed.feed["title"])
+    for entry in feed.entries:
+        summary = entry.get("summary") or ""
+        if "<" in summary:
+            summary = _html_to_text(summary)
+        parts.append(f"{entry.get('title', '')}\n{summary}".strip())
+    return "\n\n".join(p for p in parts if p)
+
+
+class SourceIngestor:
+    """
+    Fetches and extracts all sources of a request concurrently.
+
+    Uses one pooled async HTTP client, limits concurrent requests per host
+    and stores the extracted text in ``source_cache``, where Podcastfy's
+    extractor picks it up instead of scraping each URL sequentially.
+    Sources it cannot handle (YouTube) are left to Podcastfy.
+    """
+
+    def __init__(self, per_host_limit: int, max_connections: int, timeout: float):
+        self.per_host_limit = per_host_limit
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(max_connections=self.max_connections),
+                follow_redirects=True,
+                headers={"User-Agent": "Mozilla/5.0 (compatible; DailyPodcastBot/1.0)"}
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def ingest(
+        self,
+        sources: List[ContentSource],
+        force_refresh: bool = False
+    ) -> Dict[str, Optional[str]]:
+        """
+        Fetch all sources concurrently; returns url -> extracted text (None if
+        the source was skipped or failed and is left to Podcastfy).
+        Fresh cache entries are reused unless ``force_refresh`` is set; stale
+        ones are revalidated with a conditional GET and reused on 304.
+        """
+        start = time.perf_counter()
+        urls = [str(source.url) for source in sources]
+        results = await asyncio.gather(
+            *(self._ingest_one(source, force_refresh) for source in sources)
+        )
+        fetched = sum(1 for text in results if text is not None)
+        print(f"[Ingest] {fetched}/{len(urls)} sources ready in {time.perf_counter() - start:.2f}s")
+        return dict(zip(urls, results))
+
+    async def _ingest_one(self, source: ContentSource, force_refresh: bool) -> Optional[str]:
+        url = str(source.url)
+        entry = None if force_refresh else source_cache.get_entry(url)
+        if entry is not None and source_cache.is_fresh(entry):
+            return entry["text"]
+
+        if source.source_type == "youtube" or "youtube.com" in url or "youtu.be" in url:
+            if force_refresh:
+                source_cache.invalidate(url)
+            return None
+
+        start = time.perf_counter()
+        try:
+            async with self._host_limit(url):
+                text, validators = await self._fetch(source, entry)
+        except (httpx.HTTPError, ValueError) as e:
+            SOURCE_FETCH_SECONDS.observe(time.perf_counter() - start, source_type=source.source_type, outcome="error")
+            print(f"[Ingest] Failed to fetch {url}: {e}")
+            if force_refresh:
+                source_cache.invalidate(url)
+            return None
+
+        if text is None:
+            # 304: the stale entry is still current, so only its TTL restarts
+            SOURCE_FETCH_SECONDS.observe(
+                time.perf_counter() - start, source_type=source.source_type, outcome="not_modified"
+            )
+            source_cache.put(url, entry["text"], etag=entry.get("etag"), last_modified=entry.get("last_modified"))
+            return entry["text"]
+
+        SOURCE_FETCH_SECONDS.observe(time.perf_counter() - start, source_type=source.source_type, outcome="ok")
+        source_cache.put(url, text, **validators)
+        return text
+
+    async def _fetch(self, source: ContentSource, stale: Optional[dict] = None):
+        """
+        Returns the extracted text and the source's ETag/Last-Modified validators.
+        With a ``stale`` cache entry the request is conditional on its
+        validators, and (None, None) is returned when the source answers 304.
+        """
+        url = str(source.url)
+        headers = conditional_headers(stale) if stale else {}
+        if source.source_type == "rss":
+            response = await self.client.get(url, headers=headers)
+            if response.status_code == 304:
+                return None, None
+            response.raise_for_status()
+            text = await asyncio.to_thread(_feed_to_text, response.content)
+        elif settings.JINA_API_KEY:
+            # Same reader Podcastfy uses for web pages when a Jina key is configured
+            response = await self.client.get(
+                JINA_READER_URL + url,
+                headers={"Authorization": f"Bearer {settings.JINA_API_KEY}"}
+            )
+            response.raise_for_status()
+            text = response.text
+            # Validators belong to the reader response, not to the source
+            return self._check(text), {"etag": None, "last_modified": None}
+        else:
+            response = await self.client.get(url, headers=headers)
+            if response.status_code == 304:
+                return None, None
+            response.raise_for_status()
+            text = await asyncio.to_thread(_html_to_text, response.text)
+
+        return self._check(text), response_validators(response)
+
+    @staticmethod
+    def _check(text: str) -> str:
+        if not text.strip():
+            raise ValueError("no text extracted")
+        return text
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_limits[host]
+
+
+source_ingestor = SourceIngestor(
+    per_host_limit=settings.INGEST_PER_HOST_LIMIT,
+    max_connections=settings.INGEST_MAX_CONNECTIONS,
+    timeout=settings.INGEST_TIMEOUT_SECONDS
+)
@@ -0,0 +1,219 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+import httpx
+
+from src.config import settings
+
+
+def conditional_headers(entry: dict) -> Dict[str, str]:
+    """If-None-Match / If-Modified-Since headers from a cache entry's validators."""
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def response_validators(response: httpx.Response) -> Dict[str, Optional[str]]:
+    """ETag / Last-Modified of a source response, stored for later revalidation."""
+    return {
+        "etag": response.headers.get("etag"),
+        "last_modified": response.headers.get("last-modified"),
+    }
+
+
+class SourceCache:
+    """
+    Cache of extracted source text, keyed by URL.
+
+    Entries are fresh for ``ttl_seconds``. After that they are revalidated
+    with a conditional GET (If-None-Match / If-Modified-Since) and reused on
+    304, so unchanged pages are not scraped again. Validators come from
+    responses that are fetched anyway (concurrent ingestion, revalidation);
+    no extra request is made just to learn them. Entries are JSON files
+    bounded by total size with least-recently-used eviction.
+    """
+
+    def __init__(self, cache_dir: str, ttl_seconds: int, max_bytes: int, timeout: float = 10.0):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size in bytes
+        self._total_bytes = 0
+        self._load_index()
+
+    @staticmethod
+    def make_key(url: str) -> str:
+        return hashlib.sha256(url.strip().encode("utf-8")).hexdigest()
+
+    def get_or_fetch(
+        self,
+        url: str,
+        extract: Callable[[str], str],
+        force_refresh: bool = False
+    ) -> str:
+        """
+        Return the extracted text for ``url``, calling ``extract(url)`` only
+        when there is no entry or the source has changed upstream.
+        """
+        key = self.make_key(url)
+        entry = None if force_refresh else self._read(key)
+        validators: Dict[str, Optional[str]] = {}
+
+        if entry is not None:
+            if self.is_fresh(entry):
+                self._count("hits")
+                return entry["text"]
+            response = self._revalidate(url, entry)
+            if response is not None and response.status_code == 304:
+                self._count("revalidated")
+                entry["validated_at"] = time.time()
+                self._write(key, entry)
+                return entry["text"]
+            if response is not None and response.is_success:
+                # Changed upstream: the new validators belong to the text extracted below
+                validators = response_validators(response)
+
+        self._count("misses")
+        text = extract(url)
+        self.put(url, text, **validators)
+        return text
+
+    def get(self, url: str) -> Optional[str]:
+        """Return cached text if it is still within its TTL."""
+        entry = self.get_entry(url)
+        if entry is None or not self.is_fresh(entry):
+            return None
+        return entry["text"]
+
+    def get_entry(self, url: str) -> Optional[dict]:
+        """
+        The cached entry (text, etag, last_modified, timestamps) regardless of
+        its age, so callers can revalidate a stale one.
+        """
+        return self._read(self.make_key(url))
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry["validated_at"] < self.ttl_seconds
+
+    def invalidate(self, url: str):
+        key = self.make_key(url)
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def put(self, url: str, text: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        now = time.time()
+        self._write(self.make_key(url), {
+            "url": url,
+            "text": text,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": now,
+            "validated_at": now,
+        })
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+            }
+
+    def _revalidate(self, url: str, entry: dict) -> Optional[httpx.Response]:
+        """Conditional GET against the source; None without validators or on error."""
+        headers = conditional_headers(entry)
+        if not headers:
+            return None
+        try:
+            return httpx.get(url, headers=headers, timeout=self.timeout, follow_redirects=True)
+        except httpx.HTTPError as e:
+            print(f"[SourceCache] Revalidation failed for {url}: {e}")
+            return None
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _read(self, key: str) -> Optional[dict]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(self._path(key))
+            return entry
+        except (OSError, ValueError) as e:
+            print(f"[SourceCache] Dropping unreadable entry {key[:12]}: {e}")
+            with self._lock:
+                self._total_bytes -= self._entries.pop(key, 0)
+            return None
+
+    def _write(self, key: str, entry: dict):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+
+        with self._lock:
+            self._total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            evicted = []
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                old_key, old_size = self._entries.popitem(last=False)
+                self._total_bytes -= old_size
+                evicted.append(old_key)
+
+        for old_key in evicted:
+            try:
+                os.remove(self._path(old_key))
+            except FileNotFoundError:
+                pass
+
+    def _load_index(self):
+        """Rebuild the LRU order from files on disk (oldest mtime first)."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            st = os.stat(os.path.join(self.cache_dir, name))
+            files.append((st.st_mtime, name[:-5], st.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+
+source_cache = SourceCache(
+    cache_dir=os.path.join(settings.DATA_DIR, "cache", "sources"),
+    ttl_seconds=settings.SOURCE_CACHE_TTL_SECONDS,
+    max_bytes=settings.SOURCE_CACHE_MAX_MB * 1024 * 1024
+)
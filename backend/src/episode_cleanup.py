@@ -0,0 +1,191 @@
+import os
+import time
+import shutil
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from src.config import settings
+from src.storage_client import storage_client
+from src.episode_index import episode_index
+from src.audio.streaming import HLS_DIR, PLAYLIST_NAME
+
+AUDIO_DIR = "./data/audio"
+
+
+@dataclass
+class EpisodeFile:
+    """One episode, local and/or in Supabase Storage, keyed by file name."""
+    name: str
+    created_at: datetime
+    size: int
+    local_path: Optional[str] = None
+    remote: bool = False
+
+
+def delete_episodes(filenames: List[str], audio_dir: str = AUDIO_DIR) -> Dict[str, List[str]]:
+    """
+    Delete episodes from local storage, Supabase Storage and the episode index.
+    Remote files are removed with batched ``remove([...])`` calls instead of
+    one round trip per file. Returns the deleted, not found and failed names.
+    """
+    deleted, failed = set(), set()
+    for name in filenames:
+        local_path = os.path.join(audio_dir, name)
+        if not os.path.exists(local_path):
+            continue
+        try:
+            os.remove(local_path)
+            deleted.add(name)
+        except OSError as e:
+            print(f"[ERROR] Failed to delete local file {local_path}: {e}")
+            failed.add(name)
+
+    if storage_client.is_enabled():
+        removed, remote_failed = storage_client.delete_audio_batch(list(filenames))
+        deleted.update(removed)
+        failed.update(remote_failed)
+
+    failed -= deleted
+    episode_index.delete(list(deleted))
+    return {
+        "deleted": [n for n in filenames if n in deleted],
+        "not_found": [n for n in filenames if n not in deleted and n not in failed],
+        "failed": [n for n in filenames if n in failed],
+    }
+
+
+def prune_hls_streams(max_age_seconds: float, hls_dir: str = HLS_DIR) -> List[str]:
+    """
+    Delete HLS stream directories whose playlist has not been rewritten for
+    ``max_age_seconds``. A running stream rewrites it after every segment, so
+    only finished, failed or abandoned streams are removed. Returns their IDs.
+    """
+    if not os.path.isdir(hls_dir):
+        return []
+    cutoff = time.time() - max_age_seconds
+    removed = []
+    for entry in os.scandir(hls_dir):
+        if not entry.is_dir():
+            continue
+        playlist = os.path.join(entry.path, PLAYLIST_NAME)
+        try:
+            modified = os.path.getmtime(playlist if os.path.exists(playlist) else entry.path)
+        except OSError:
+            continue
+        if modified < cutoff:
+            shutil.rmtree(entry.path, ignore_errors=True)
+            removed.append(entry.name)
+    return removed
+
+
+class EpisodeRetention:
+    """
+    Retention policy for generated episodes.
+
+    Collects episodes from the local audio directory and Supabase Storage,
+    expires those older than ``max_age_days`` and then the oldest ones until
+    the archive fits in ``max_total_bytes`` (0 disables either limit), and
+    deletes them through ``delete_episodes``. Each pass also removes HLS
+    stream directories idle for ``hls_max_age_seconds``. Runs periodically
+    off the request path.
+    """
+
+    def __init__(
+        self,
+        audio_dir: str,
+        max_age_days: int,
+        max_total_bytes: int,
+        interval_seconds: int,
+        hls_max_age_seconds: float
+    ):
+        self.audio_dir = audio_dir
+        self.max_age_days = max_age_days
+        self.max_total_bytes = max_total_bytes
+        self.interval_seconds = interval_seconds
+        self.hls_max_age_seconds = hls_max_age_seconds
+        self._run_lock = asyncio.Lock()
+
+    def collect(self) -> List[EpisodeFile]:
+        """All episodes, oldest first. A file kept both locally and remotely is one episode."""
+        episodes: Dict[str, EpisodeFile] = {}
+        if os.path.isdir(self.audio_dir):
+            for entry in os.scandir(self.audio_dir):
+                if entry.is_file() and entry.name.endswith(".mp3"):
+                    st = entry.stat()
+                    episodes[entry.name] = EpisodeFile(
+                        name=entry.name,
+                        created_at=datetime.fromtimestamp(st.st_mtime, tz=timezone.utc),
+                        size=st.st_size,
+                        local_path=entry.path
+                    )
+
+        for obj in storage_client.list_audio() if storage_client.is_enabled() else []:
+            created_at = datetime.fromisoformat(obj["created_at"].replace("Z", "+00:00"))
+            size = (obj.get("metadata") or {}).get("size", 0)
+            episode = episodes.get(obj["name"])
+            if episode is None:
+                episodes[obj["name"]] = EpisodeFile(obj["name"], created_at, size, remote=True)
+            else:
+                episode.remote = True
+                episode.created_at = min(episode.created_at, created_at)
+
+        return sorted(episodes.values(), key=lambda e: e.created_at)
+
+    def expired(self, episodes: List[EpisodeFile], now: Optional[datetime] = None) -> List[EpisodeFile]:
+        """Episodes to delete under the policy; ``episodes`` must be oldest first."""
+        now = now or datetime.now(timezone.utc)
+        expired = []
+        keep = episodes
+        if self.max_age_days > 0:
+            cutoff = now - timedelta(days=self.max_age_days)
+            expired = [e for e in episodes if e.created_at < cutoff]
+            keep = episodes[len(expired):]
+
+        if self.max_total_bytes > 0:
+            total = sum(e.size for e in keep)
+            for episode in keep:
+                if total <= self.max_total_bytes:
+                    break
+                expired.append(episode)
+                total -= episode.size
+        return expired
+
+    def run_once(self) -> Dict[str, List[str]]:
+        streams = prune_hls_streams(self.hls_max_age_seconds)
+        if streams:
+            print(f"[Retention] Deleted {len(streams)} HLS streams")
+
+        episodes = self.collect()
+        expired = self.expired(episodes)
+        if not expired:
+            return {"deleted": [], "not_found": [], "failed": []}
+        result = delete_episodes([e.name for e in expired], self.audio_dir)
+        print(
+            f"[Retention] Deleted {len(result['deleted'])}/{len(episodes)} episodes "
+            f"({len(result['failed'])} failed)"
+        )
+        return result
+
+    async def run(self) -> Dict[str, List[str]]:
+        """Run one pass in a worker thread; concurrent calls wait for the running pass."""
+        async with self._run_lock:
+            return await asyncio.to_thread(self.run_once)
+
+    async def run_forever(self):
+        while True:
+            try:
+                await self.run()
+            except Exception as e:
+                print(f"[Retention] Pass failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+
+episode_retention = EpisodeRetention(
+    audio_dir=AUDIO_DIR,
+    max_age_days=settings.RETENTION_MAX_AGE_DAYS,
+    max_total_bytes=settings.RETENTION_MAX_TOTAL_MB * 1024 * 1024,
+    interval_seconds=settings.RETENTION_INTERVAL_SECONDS,
+    hls_max_age_seconds=settings.RETENTION_HLS_MAX_AGE_HOURS * 3600
+)
@@ -0,0 +1,227 @@
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from src.config import settings
+from src.models import EpisodeSummary
+
+# Columns GET /episodes/catalog may sort by
+SORT_COLUMNS = ("created_at", "title", "duration_seconds", "size_bytes")
+
+
+def audio_duration(path: str) -> float:
+    """Duration of an audio file in seconds (ffprobe via pydub), 0.0 if unknown."""
+    from pydub.utils import mediainfo
+
+    try:
+        return float(mediainfo(path).get("duration") or 0.0)
+    except Exception as e:
+        print(f"[EpisodeIndex] Could not probe duration of {path}: {e}")
+        return 0.0
+
+
+class EpisodeIndex:
+    """
+    SQLite catalog of generated episodes, keyed by audio file name.
+
+    Rows are written when an episode's audio is exported, so listings read
+    metadata (title, sources, duration, size, engine, storage URL) from the
+    index instead of scanning and probing files. Episodes already in the
+    audio directory when the index is first created are backfilled by
+    ``backfill``, which runs as a startup background task so probing many
+    files never delays startup.
+    """
+
+    def __init__(self, path: str, audio_dir: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            exists = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'episodes'"
+            ).fetchone()
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS episodes (
+                    file_name TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    sources TEXT NOT NULL,
+                    duration_seconds REAL,
+                    size_bytes INTEGER NOT NULL,
+                    tts_engine TEXT,
+                    local_path TEXT,
+                    storage_url TEXT,
+                    created_at TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_episodes_created ON episodes(created_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_episodes_engine ON episodes(tts_engine, created_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_episodes_storage_url ON episodes(storage_url)")
+        self.audio_dir = audio_dir
+        self._needs_backfill = not exists
+
+    def add(
+        self,
+        file_name: str,
+        title: str,
+        sources: List[str],
+        duration_seconds: Optional[float],
+        size_bytes: int,
+        tts_engine: Optional[str],
+        local_path: Optional[str] = None,
+        storage_url: Optional[str] = None,
+        created_at: Optional[datetime] = None
+    ):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO episodes
+                    (file_name, title, sources, duration_seconds, size_bytes,
+                     tts_engine, local_path, storage_url, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    file_name, title, json.dumps(sources, ensure_ascii=False), duration_seconds,
+                    size_bytes, tts_engine, local_path, storage_url,
+                    (created_at or datetime.now()).isoformat()
+                )
+            )
+
+    def set_storage_url(self, file_name: str, storage_url: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE episodes SET storage_url = ? WHERE file_name = ?", (storage_url, file_name)
+            )
+
+    def find(self, path: str) -> Optional[EpisodeSummary]:
+        """Episode by its returned file path: public URL, local path or file name."""
+        file_name = os.path.basename(path.split("?", 1)[0])
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM episodes WHERE file_name = ? OR storage_url = ?", (file_name, path)
+            ).fetchone()
+        return self._from_row(row) if row else None
+
+    def list(
+        self,
+        limit: Optional[int] = 50,
+        offset: int = 0,
+        sort_by: str = "created_at",
+        order: str = "desc",
+        tts_engine: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        search: Optional[str] = None,
+        local_only: bool = False
+    ) -> Tuple[List[EpisodeSummary], int]:
+        """One page of episodes (all of them with ``limit=None``) and the total number matching the filters."""
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort_by}")
+        clauses, params = [], []
+        if tts_engine is not None:
+            clauses.append("tts_engine = ?")
+            params.append(tts_engine)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since.isoformat())
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until.isoformat())
+        if search:
+            clauses.append("title LIKE ?")
+            params.append(f"%{search}%")
+        if local_only:
+            clauses.append("local_path IS NOT NULL")
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        direction = "ASC" if order == "asc" else "DESC"
+
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM episodes{where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT * FROM episodes{where} ORDER BY {sort_by} {direction}, file_name LIMIT ? OFFSET ?",
+                # LIMIT -1 is unlimited in SQLite
+                (*params, -1 if limit is None else limit, offset)
+            ).fetchall()
+        return [self._from_row(row) for row in rows], total
+
+    def delete(self, file_names: List[str]):
+        if not file_names:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM episodes WHERE file_name = ?", [(name,) for name in file_names]
+            )
+
+    def backfill(self):
+        """
+        Index the files that were in the audio directory when the index was
+        created, then probe durations that are still unknown.
+        Rows are inserted first with duration_seconds NULL (listed at once);
+        ffprobe runs afterwards, one file at a time. Blocking; run in a thread.
+        """
+        if self._needs_backfill:
+            self._needs_backfill = False
+            self._backfill_rows()
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT file_name, local_path FROM episodes "
+                "WHERE duration_seconds IS NULL AND local_path IS NOT NULL"
+            ).fetchall()
+        for row in rows:
+            duration = audio_duration(row["local_path"])
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "UPDATE episodes SET duration_seconds = ? WHERE file_name = ?", (duration, row["file_name"])
+                )
+        if rows:
+            print(f"[EpisodeIndex] Probed durations of {len(rows)} backfilled episodes")
+
+    def _backfill_rows(self):
+        if not os.path.isdir(self.audio_dir):
+            return
+        rows = []
+        for entry in os.scandir(self.audio_dir):
+            if entry.is_file() and entry.name.endswith(".mp3"):
+                st = entry.stat()
+                rows.append((
+                    entry.name, entry.name, "[]", st.st_size, entry.path,
+                    datetime.fromtimestamp(st.st_mtime).isoformat()
+                ))
+        # OR IGNORE: an episode published meanwhile keeps its real metadata
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT OR IGNORE INTO episodes (file_name, title, sources, size_bytes, local_path, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+        if rows:
+            print(f"[EpisodeIndex] Backfilled {len(rows)} existing episodes from {self.audio_dir}")
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> EpisodeSummary:
+        return EpisodeSummary(
+            file_name=row["file_name"],
+            title=row["title"],
+            sources=json.loads(row["sources"]),
+            duration_seconds=row["duration_seconds"],
+            size_bytes=row["size_bytes"],
+            tts_engine=row["tts_engine"],
+            file_path=row["storage_url"] or row["local_path"] or row["file_name"],
+            storage_url=row["storage_url"],
+            created_at=datetime.fromisoformat(row["created_at"])
+        )
+
+
+episode_index = EpisodeIndex(
+    path=settings.EPISODE_INDEX_PATH,
+    audio_dir="./data/audio"
+)
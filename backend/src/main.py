@@ -2,8 +2,19 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from src.config import settings
 from src.api_router import router as api_router
+from src.audio.job_queue import job_scheduler
+from src.audio.task_manager import task_manager
+from src.audio.engine_loader import warm_up_qwen
+from src.audio.tts_engines import close_engines
+from src.content.ingestion import source_ingestor
+from src.storage_client import storage_client
+from src.episode_cleanup import episode_retention
+from src.episode_index import episode_index
+from src.metrics import registry as metrics_registry
+import asyncio
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -33,6 +44,37 @@ DATA_DIR = "./data"
 os.makedirs(DATA_DIR, exist_ok=True)
 app.mount("/data", StaticFiles(directory=DATA_DIR), name="data")
 
+@app.on_event("startup")
+async def recover_tasks():
+    # Only the web process may do this: TTS worker processes share the task
+    # store file and would otherwise fail this process's queued jobs
+    task_manager.recover_interrupted()
+
+@app.on_event("startup")
+async def start_episode_backfill():
+    # ffprobe on existing files can take a while; keep it off the startup path
+    app.state.episode_backfill = asyncio.create_task(asyncio.to_thread(episode_index.backfill))
+
+@app.on_event("startup")
+async def start_warm_up():
+    # Runs in the background so health checks pass while the model loads
+    if settings.QWEN_WARMUP_ON_STARTUP:
+        app.state.qwen_warm_up = asyncio.create_task(warm_up_qwen())
+
+@app.on_event("startup")
+async def start_retention():
+    if settings.RETENTION_ENABLED:
+        app.state.retention = asyncio.create_task(episode_retention.run_forever())
+
+@app.on_event("shutdown")
+async def shutdown_workers():
+    if getattr(app.state, "retention", None) is not None:
+        app.state.retention.cancel()
+    job_scheduler.shutdown()
+    await source_ingestor.aclose()
+    await storage_client.aclose()
+    await close_engines()
+
 @app.get("/")
 def read_root():
     return {
@@ -41,6 +83,11 @@ def read_root():
         "tts_engine": settings.TTS_ENGINE
     }
 
+@app.get("/metrics")
+def metrics():
+    """Prometheus text exposition of the pipeline stage metrics."""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/health")
 def health_check():
     return {"status": "ok", "env": settings.ENV}
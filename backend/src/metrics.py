@@ -0,0 +1,199 @@
+import time
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+# Seconds; covers sub-second chunk synthesis up to multi-minute episode stages
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+# Synthesis time / audio duration; below 1.0 is faster than real time
+RTF_BUCKETS = (0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Metric:
+    """Base for metrics rendered in the Prometheus text exposition format."""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Histogram(Metric):
+    """Cumulative histogram of observed values per label set."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label values -> (per-bucket counts, sum, count)
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._label_values(labels)
+        with self._lock:
+            counts, total, count = self._series.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._series[key] = (counts, total + value, count + 1)
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of the block (also when it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        lines = []
+        for key, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Gauge(Metric):
+    """Value read at scrape time from ``function`` (one sample per label set it returns)."""
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        function: Callable[[], Dict[Tuple[str, ...], float]],
+        labelnames: Sequence[str] = ()
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+
+    def _samples(self) -> List[str]:
+        try:
+            values = self.function()
+        except Exception as e:
+            print(f"[Metrics] Could not read {self.name}: {e}")
+            return []
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# Pipeline stages
+SOURCE_FETCH_SECONDS = registry.register(Histogram(
+    "podcast_source_fetch_seconds", "Time to fetch and extract one source", ["source_type", "outcome"]
+))
+SCRIPT_GENERATION_SECONDS = registry.register(Histogram(
+    "podcast_script_generation_seconds", "Time for the LLM to generate a script (cache misses only)", ["mode"]
+))
+TTS_CHUNK_SECONDS = registry.register(Histogram(
+    "podcast_tts_chunk_seconds", "Synthesis time per text chunk", ["engine"]
+))
+TTS_REAL_TIME_FACTOR = registry.register(Histogram(
+    "podcast_tts_real_time_factor", "Synthesis time divided by the duration of the audio, per chunk",
+    ["engine"], buckets=RTF_BUCKETS
+))
+AUDIO_ASSEMBLY_SECONDS = registry.register(Histogram(
+    "podcast_audio_assembly_seconds", "Time spent assembling chunks and pauses, per episode"
+))
+MP3_ENCODE_SECONDS = registry.register(Histogram(
+    "podcast_mp3_encode_seconds", "Time spent encoding an episode to MP3"
+))
+UPLOAD_SECONDS = registry.register(Histogram(
+    "podcast_upload_seconds", "Time to upload an episode to Supabase Storage", ["method"]
+))
+
+
+def observe_tts_chunk(engine: str, seconds: float, samples: int, sample_rate: int):
+    """Record one synthesized chunk's time and real-time factor."""
+    TTS_CHUNK_SECONDS.observe(seconds, engine=engine)
+    if samples and sample_rate:
+        TTS_REAL_TIME_FACTOR.observe(seconds / (samples / sample_rate), engine=engine)
+
+
+def _queue_depth() -> Dict[Tuple[str, ...], float]:
+    from src.audio.job_queue import job_scheduler
+    return {(): job_scheduler.depth}
+
+
+def _running_tasks() -> Dict[Tuple[str, ...], float]:
+    from src.audio.job_queue import job_scheduler
+    return {(): job_scheduler.running}
+
+
+def _model_loaded() -> Dict[Tuple[str, ...], float]:
+    from src.audio.engine_loader import is_qwen_loaded
+    return {("qwen",): 1.0 if is_qwen_loaded() else 0.0}
+
+
+registry.register(Gauge("podcast_queue_depth", "TTS jobs waiting to start", _queue_depth))
+registry.register(Gauge("podcast_running_tasks", "TTS jobs currently running", _running_tasks))
+registry.register(Gauge(
+    "podcast_tts_model_loaded", "Whether a local TTS model is loaded in this process", _model_loaded, ["engine"]
+))
@@ -50,12 +50,45 @@ class AudioFromScriptRequest(BaseModel):
     """Request to generate audio from an existing script."""
     script: DialogueScript
     tts_engine: Optional[str] = None  # 'edge-tts' or 'chatterbox'
+    priority: int = Field(0, description="Async queue priority (lower runs first)")
 
 class AudioResponse(BaseModel):
     """Response for audio generation from script."""
     file_path: str
     tts_engine_used: Optional[str] = None
 
+class StreamResponse(BaseModel):
+    """Response for streaming (HLS) audio generation. ``stream_id`` doubles as the task ID."""
+    stream_id: str
+    playlist_url: str
+
+class EpisodeSummary(BaseModel):
+    """Indexed episode metadata."""
+    file_name: str
+    title: str
+    sources: List[str]
+    duration_seconds: Optional[float] = None  # None until a backfilled file has been probed
+    size_bytes: int
+    tts_engine: Optional[str] = None
+    file_path: str  # Public URL when uploaded, local path otherwise
+    storage_url: Optional[str] = None
+    created_at: datetime
+
+class EpisodeListResponse(BaseModel):
+    episodes: List[EpisodeSummary]
+    total: int
+    limit: int
+    offset: int
+
+class EpisodeBulkDeleteRequest(BaseModel):
+    """Episode file names to delete (local and Supabase)."""
+    filenames: List[str] = Field(..., min_length=1)
+
+class EpisodeBulkDeleteResponse(BaseModel):
+    deleted: List[str]
+    not_found: List[str]
+    failed: List[str]
+
 # --- Task Models ---
 
 class TaskStatusResponse(BaseModel):
@@ -66,6 +99,8 @@ class TaskStatusResponse(BaseModel):
     error: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    queue_position: Optional[int] = None
 
 class AsyncTaskResponse(BaseModel):
     task_id: str
+    queue_position: Optional[int] = None
@@ -1,32 +1,122 @@
 """
 Podcastfy Client - Podcastfy 래퍼 및 어댑터
 
-Podcastfy 라이브러리를 사용하여 팟캐스트를 생성하고,
+Podcastfy 라이브러리를 사용하여 팟캐스트 대본을 생성하고,
 출력 형식을 기존 DialogueScript 모델로 변환합니다.
 """
 import os
-import re
+import copy
+import time
 import glob
-from typing import List, Optional, Tuple
+import shutil
+import threading
+from typing import AsyncIterator, List, Optional
 from datetime import datetime
 
-from podcastfy.client import generate_podcast
 from src.models import DialogueScript, DialogueLine
 from src.config import settings
-from src.storage_client import storage_client
+from src.content.source_cache import source_cache
+from src.script_cache import script_cache
+from src.script_stream import TranscriptStreamParser, stream_dialogue_lines, title_from_lines
+from src.metrics import SCRIPT_GENERATION_SECONDS
 import uuid
-from unittest.mock import patch
-from podcastfy.utils.config import load_config as original_load_config
+from contextlib import contextmanager
+
+
+# 스레드별 Config 주입 (unittest.mock.patch로 모듈 전역을 매 요청마다 바꾸지 않음)
+_config_override = threading.local()
+_config_hook_lock = threading.Lock()
+_config_hook_installed = False
+
+
+def _install_config_hook():
+    """
+    podcastfy.content_generator.load_config를 한 번만 교체
+    
+    교체된 함수는 현재 스레드에 주입된 Config가 있으면 그것을, 없으면 원래 load_config 결과를 반환합니다.
+    """
+    global _config_hook_installed
+    with _config_hook_lock:
+        if _config_hook_installed:
+            return
+        import podcastfy.content_generator as content_generator
+        original_load_config = content_generator.load_config
+        
+        def load_config(*args, **kwargs):
+            config = getattr(_config_override, "config", None)
+            if config is not None:
+                return config
+            return original_load_config(*args, **kwargs)
+        
+        content_generator.load_config = load_config
+        _config_hook_installed = True
+
+
+@contextmanager
+def _inject_config(config):
+    """with 블록 동안 현재 스레드의 ContentGenerator가 config를 사용하도록 설정"""
+    _install_config_hook()
+    _config_override.config = config
+    try:
+        yield
+    finally:
+        _config_override.config = None
+
+
+# 스레드별 소스 캐시 옵션 (force_refresh)
+_source_options = threading.local()
+_extractor_hook_lock = threading.Lock()
+_extractor_hook_installed = False
+
+
+def _install_extractor_hook():
+    """
+    ContentExtractor.extract_content를 한 번만 감싸서 source_cache를 거치도록 설정
+    
+    같은 URL은 TTL 동안 다시 스크래핑하지 않고, 이후에는 ETag/Last-Modified로 재검증합니다.
+    """
+    global _extractor_hook_installed
+    with _extractor_hook_lock:
+        if _extractor_hook_installed:
+            return
+        from podcastfy.content_parser.content_extractor import ContentExtractor
+        original_extract = ContentExtractor.extract_content
+        
+        def extract_content(self, source: str) -> str:
+            if not settings.SOURCE_CACHE_ENABLED or not source.startswith(("http://", "https://")):
+                return original_extract(self, source)
+            return source_cache.get_or_fetch(
+                source,
+                lambda url: original_extract(self, url),
+                force_refresh=getattr(_source_options, "force_refresh", False)
+            )
+        
+        ContentExtractor.extract_content = extract_content
+        _extractor_hook_installed = True
+
+
+@contextmanager
+def _source_fetch_options(force_refresh: bool):
+    """with 블록 동안 현재 스레드의 소스 추출 옵션 설정"""
+    _install_extractor_hook()
+    _source_options.force_refresh = force_refresh
+    try:
+        yield
+    finally:
+        _source_options.force_refresh = False
 
 
 class PodcastfyClient:
     """
     Podcastfy 라이브러리 래퍼 + 어댑터
     
-    - Podcastfy를 호출하여 팟캐스트 생성
+    - Podcastfy를 호출하여 대본 생성 (오디오는 api_router의 TTS 엔진이 담당)
     - <Person1>, <Person2> 태그를 DialogueScript로 변환
     """
     
+    # 대본 생성에 강제 적용하는 Gemini 모델
+    GEMINI_MODEL = "gemini-2.0-flash"
+    
     def __init__(self):
         self.transcript_dir = "./data/transcripts"
         self.audio_dir = "./data/audio"
@@ -58,100 +148,53 @@ class PodcastfyClient:
             "Person1": "Host A",
             "Person2": "Host B"
         }
+        
+        # Gemini 모델 설정이 반영된 Config (최초 사용 시 생성)
+        self._patched_config = None
+        self._config_lock = threading.Lock()
 
-    def _get_patched_config(self):
-        """Gemini 모델을 강제로 설정하는 Config 객체 반환"""
-        config = original_load_config()
-        # content_generator가 없으면 생성, 있으면 업데이트
-        if 'content_generator' not in config.config:
-            config.config['content_generator'] = {}
-        config.config['content_generator']['gemini_model'] = "gemini-2.0-flash"
-        # 속성 업데이트 (Config 클래스 내부 로직 반영)
-        config._set_attributes()
+    def _new_job_dir(self) -> str:
+        """작업별 transcript 디렉토리 생성 (동시 실행 시 파일 충돌 방지)"""
+        job_dir = os.path.join(self.transcript_dir, uuid.uuid4().hex)
+        os.makedirs(job_dir, exist_ok=True)
+        return job_dir
+    
+    def _job_conversation_config(self, job_dir: str) -> dict:
+        """transcript 출력 경로만 작업 디렉토리로 바꾼 conversation_config 사본"""
+        config = copy.deepcopy(self.conversation_config)
+        output_directories = config["text_to_speech"].setdefault("output_directories", {})
+        output_directories["transcripts"] = job_dir
+        output_directories["audio"] = self.audio_dir
         return config
     
-    def generate_from_urls(
-        self, 
-        urls: List[str],
-        tts_engine: Optional[str] = "edge"
-    ) -> Tuple[str, DialogueScript]:
+    def _get_patched_config(self):
         """
-        URL 목록에서 팟캐스트 생성
-        
-        Args:
-            urls: 콘텐츠 URL 목록
-            tts_engine: TTS 엔진 (edge, openai, elevenlabs)
+        Gemini 모델을 강제로 설정하는 Config 객체 반환
         
-        Returns:
-            tuple: (오디오 파일 경로, DialogueScript)
+        YAML 파싱은 최초 1회만 수행하고, 이후에는 캐시된 객체를 공유합니다 (읽기 전용으로 취급).
         """
-        # Debug: Check environment variables
-        jina_key = os.environ.get("JINA_API_KEY")
-        print(f"[DEBUG] JINA_API_KEY configured: {bool(jina_key)}")
-        if jina_key:
-            print(f"[DEBUG] JINA_API_KEY prefix: {jina_key[:4]}...")
-
-        # Patch load_config to force Gemini Flash model
-        with patch('podcastfy.content_generator.load_config', side_effect=self._get_patched_config):
-            audio_file = generate_podcast(
-                urls=urls,
-                conversation_config=self.conversation_config,
-                tts_model=tts_engine,
-            )
-        
+        if self._patched_config is not None:
+            return self._patched_config
         
-        # 가장 최근 transcript 파일 찾기
-        transcript_path = self._find_latest_transcript()
-        script = self._parse_transcript(transcript_path)
-        
-        # Supabase Storage가 활성화되어 있으면 업로드
-        if storage_client.is_enabled():
-            try:
-                # UUID로 파일명 생성 (충돌 방지 및 보안)
-                remote_name = f"{uuid.uuid4()}.mp3"
-                print(f"[INFO] Uploading audio to Supabase: {remote_name}")
-                audio_url = storage_client.upload_audio(audio_file, remote_name)
-                
-                # 로컬 파일 정리
-                if os.path.exists(audio_file):
-                    os.remove(audio_file)
-                
-                audio_file = audio_url
-                print(f"[INFO] Upload successful: {audio_file}")
-            except Exception as e:
-                print(f"[ERROR] Upload failed, keeping local file: {e}")
-
-        return audio_file, script
-    
-    def generate_from_text(
-        self, 
-        text: str,
-        tts_engine: Optional[str] = "edge"
-    ) -> Tuple[str, DialogueScript]:
-        raise NotImplementedError("Direct text input not supported by installed podcastfy version")
-        
-        transcript_path = self._find_latest_transcript()
-        script = self._parse_transcript(transcript_path)
-        
-        # Supabase Storage가 활성화되어 있으면 업로드
-        if storage_client.is_enabled():
-            try:
-                remote_name = f"{uuid.uuid4()}.mp3"
-                audio_url = storage_client.upload_audio(audio_file, remote_name)
-                
-                if os.path.exists(audio_file):
-                    os.remove(audio_file)
-                
-                audio_file = audio_url
-            except Exception as e:
-                print(f"[ERROR] Upload failed: {e}")
-
-        return audio_file, script
+        with self._config_lock:
+            if self._patched_config is None:
+                from podcastfy.utils.config import load_config as original_load_config
+                config = original_load_config()
+                # content_generator가 없으면 생성, 있으면 업데이트
+                if 'content_generator' not in config.config:
+                    config.config['content_generator'] = {}
+                config.config['content_generator']['gemini_model'] = self.GEMINI_MODEL
+                # 속성 업데이트 (Config 클래스 내부 로직 반영)
+                config._set_attributes()
+                self._patched_config = config
+        return self._patched_config
     
     def generate_script_only(
         self, 
         urls: List[str] = None,
-        text: str = None
+        text: str = None,
+        force_refresh: bool = False,
+        refresh_sources: Optional[bool] = None
     ) -> DialogueScript:
         """
         스크립트만 생성 (오디오 없이)
@@ -159,75 +202,125 @@ class PodcastfyClient:
         Args:
             urls: URL 목록 (옵션)
             text: 텍스트 콘텐츠 (옵션)
+            force_refresh: True면 대본 캐시를 무시하고 다시 생성
+            refresh_sources: True면 소스 캐시를 무시하고 다시 추출 (기본: force_refresh)
         
         Returns:
             DialogueScript: 변환된 대본
         """
-        # Patch load_config to force Gemini Flash model
-        with patch('podcastfy.content_generator.load_config', side_effect=self._get_patched_config):
-            generate_podcast(
-                urls=urls,
-                conversation_config=self.conversation_config,
-                transcript_only=True,
-            )
+        if refresh_sources is None:
+            refresh_sources = force_refresh
+        
+        if not force_refresh:
+            cached = self._get_cached_script(urls)
+            if cached is not None:
+                return cached
+
+        # Podcastfy(langchain, TTS 클라이언트 포함)는 무거우므로 첫 사용 시 import
+        from podcastfy.client import generate_podcast
         
-        transcript_path = self._find_latest_transcript()
-        return self._parse_transcript(transcript_path)
+        job_dir = self._new_job_dir()
+        try:
+            # Gemini Flash 모델 설정을 이 스레드에만 주입
+            with _inject_config(self._get_patched_config()), _source_fetch_options(refresh_sources), \
+                    SCRIPT_GENERATION_SECONDS.time(mode="podcastfy"):
+                transcript_path = generate_podcast(
+                    urls=urls,
+                    conversation_config=self._job_conversation_config(job_dir),
+                    transcript_only=True,
+                )
+            
+            # transcript_only 모드는 transcript 경로를 반환함 (없으면 작업 디렉토리 탐색)
+            if not transcript_path or not os.path.exists(transcript_path):
+                transcript_path = self._find_latest_transcript(job_dir)
+            script = self._parse_transcript(transcript_path)
+        finally:
+            # 파싱이 끝난 transcript는 필요 없으므로 작업 디렉토리 삭제
+            shutil.rmtree(job_dir, ignore_errors=True)
+        self._store_cached_script(urls, script)
+        return script
     
-    def generate_audio_from_script(
-        self,
-        script: DialogueScript,
-        tts_engine: Optional[str] = "edge"
-    ) -> str:
+    def source_texts(self, urls: Optional[List[str]]) -> Optional[List[str]]:
+        """모든 URL의 추출 텍스트 (소스 캐시가 꺼져 있거나 하나라도 캐시에 없으면 None)"""
+        if not urls or not settings.SOURCE_CACHE_ENABLED:
+            return None
+        texts = []
+        for url in urls:
+            text = source_cache.get(url)
+            if text is None:
+                return None
+            texts.append(text)
+        return texts
+    
+    def _script_cache_key(self, urls: Optional[List[str]]) -> Optional[str]:
         """
-        기존 DialogueScript에서 오디오 생성
+        대본 캐시 키 (소스 텍스트 + conversation_config + 모델)
         
-        Args:
-            script: 기존 DialogueScript 형식
-            tts_engine: TTS 엔진
+        모든 URL의 추출 텍스트가 소스 캐시에 있을 때만 키를 만들 수 있습니다.
+        """
+        if not settings.SCRIPT_CACHE_ENABLED:
+            return None
+        texts = self.source_texts(urls)
+        if texts is None:
+            return None
+        return script_cache.make_key(texts, self.conversation_config, self.GEMINI_MODEL)
+    
+    def _get_cached_script(self, urls: Optional[List[str]]) -> Optional[DialogueScript]:
+        key = self._script_cache_key(urls)
+        if key is None:
+            return None
+        script = script_cache.get(key)
+        if script is not None:
+            print(f"[INFO] Script cache hit: {key[:12]}")
+        return script
+    
+    def _store_cached_script(self, urls: Optional[List[str]], script: DialogueScript):
+        # 생성 후에는 Podcastfy가 추출한 텍스트도 소스 캐시에 있으므로 다시 키 계산
+        key = self._script_cache_key(urls)
+        if key is not None and script.lines:
+            script_cache.put(key, script)
+    
+    async def stream_script_lines(
+        self,
+        urls: List[str],
+        force_refresh: bool = False
+    ) -> AsyncIterator[DialogueLine]:
+        """
+        대본을 스트리밍으로 생성하며 완결된 대사부터 반환
         
-        Returns:
-            str: 오디오 파일 경로
+        Podcastfy를 거치지 않고 Gemini를 직접 호출하므로, 소스 텍스트가 모두
+        소스 캐시에 있어야 합니다 (source_texts()로 먼저 확인).
+        생성이 끝나면 대본 캐시에 저장하고, 캐시 적중 시에는 저장된 대사를 바로 반환합니다.
         """
-        # DialogueScript → Podcastfy transcript 형식 변환
-        transcript_text = self._script_to_transcript(script)
+        if not force_refresh:
+            cached = self._get_cached_script(urls)
+            if cached is not None:
+                for line in cached.lines:
+                    yield line
+                return
         
-        # Podcastfy는 transcript 파일에서 직접 오디오 생성 지원
-        # Prepare config to override model name
-        config = {
-            "llm": {
-                "model_name": "gemini-1.5-flash"
-            }
-        }
-
-        audio_file = generate_podcast(
-            transcript_file=self._save_temp_transcript(transcript_text),
-            conversation_config=self.conversation_config,
-            tts_model=tts_engine,
-            config=config
-        )
+        texts = self.source_texts(urls)
+        if texts is None:
+            raise ValueError("Streaming script generation needs every source in the source cache")
         
-        # Supabase Storage가 활성화되어 있으면 업로드
-        if storage_client.is_enabled():
-            try:
-                remote_name = f"{uuid.uuid4()}.mp3"
-                audio_url = storage_client.upload_audio(audio_file, remote_name)
-                
-                if os.path.exists(audio_file):
-                    os.remove(audio_file)
-                
-                audio_file = audio_url
-            except Exception as e:
-                print(f"[ERROR] Upload failed: {e}")
-
-        return audio_file
+        lines = []
+        start = time.perf_counter()
+        async for line in stream_dialogue_lines(
+            texts, self.conversation_config, self.speaker_map, self.GEMINI_MODEL
+        ):
+            lines.append(line)
+            yield line
+        SCRIPT_GENERATION_SECONDS.observe(time.perf_counter() - start, mode="stream")
+        
+        self._store_cached_script(urls, DialogueScript(title=title_from_lines(lines), lines=lines))
     
-    def _find_latest_transcript(self) -> str:
-        """가장 최근 생성된 transcript 파일 경로 반환"""
-        pattern = os.path.join(self.transcript_dir, "transcript_*.txt")
+    def _find_latest_transcript(self, directory: Optional[str] = None) -> str:
+        """디렉토리(기본: transcript_dir)에서 가장 최근 생성된 transcript 파일 경로 반환"""
+        directory = directory or self.transcript_dir
+        pattern = os.path.join(directory, "transcript_*.txt")
         files = glob.glob(pattern)
         if not files:
-            raise FileNotFoundError(f"No transcript files found in {self.transcript_dir}")
+            raise FileNotFoundError(f"No transcript files found in {directory}")
         return max(files, key=os.path.getctime)
     
     def _parse_transcript(self, path: str) -> DialogueScript:
@@ -239,37 +332,12 @@ class PodcastfyClient:
         with open(path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        lines = []
-        
-        # 정규식: <Person1> 또는 <Person2> 태그와 내용 추출
-        pattern = r'<(Person\d)>(.*?)(?=<Person\d>|</Person\d>|$)'
-        matches = re.findall(pattern, content, re.DOTALL)
-        
-        for speaker_tag, text in matches:
-            text = text.strip()
-            # 닫는 태그 제거
-            text = re.sub(r'</Person\d>', '', text).strip()
-            # <lang> 태그 제거
-            text = re.sub(r'<lang xml:lang="[^"]*">', '', text).strip()
-            
-            if text:
-                speaker = self.speaker_map.get(speaker_tag, speaker_tag)
-                lines.append(DialogueLine(
-                    speaker=speaker,
-                    text=text,
-                    emotion=None
-                ))
-        
-        # 제목 추출 (첫 번째 라인에서)
-        title = "Untitled Podcast"
-        if lines:
-            # 첫 번째 대사에서 "환영합니다" 등의 키워드로 제목 추출 시도
-            first_text = lines[0].text
-            if "일일 팟캐스트" in first_text or "팟캐스트" in first_text:
-                title = "일일 팟캐스트"
+        # 스트리밍 생성과 같은 파서 사용 (전체 내용을 한 번에 입력)
+        parser = TranscriptStreamParser(self.speaker_map)
+        lines = parser.feed(content) + parser.close()
         
         return DialogueScript(
-            title=title,
+            title=title_from_lines(lines),
             lines=lines,
             created_at=datetime.now()
         )
@@ -286,10 +354,3 @@ class PodcastfyClient:
             result.append(f"<{tag}>{line.text}</{tag}>")
         
         return "".join(result)
-    
-    def _save_temp_transcript(self, content: str) -> str:
-        """임시 transcript 파일 저장 및 경로 반환"""
-        temp_path = os.path.join(self.transcript_dir, "temp_transcript.txt")
-        with open(temp_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return temp_path
@@ -0,0 +1,122 @@
+"""
+Script Cache
+동일한 소스 텍스트 + conversation_config + 모델로 생성된 DialogueScript 재사용
+"""
+import os
+import re
+import json
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from src.config import settings
+from src.models import DialogueScript
+
+
+class ScriptCache:
+    """
+    생성된 대본 캐시
+
+    키: (정규화된 소스 텍스트, conversation_config, 모델 이름)의 해시
+    값: DialogueScript JSON 파일 (data/cache/scripts)
+    최대 항목 수를 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, None]" = OrderedDict()
+        self._load_index()
+
+    @staticmethod
+    def make_key(source_texts: List[str], conversation_config: dict, model_name: str) -> str:
+        """소스 순서와 공백 차이에 영향받지 않는 캐시 키 생성"""
+        normalized = sorted(
+            re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+            for text in source_texts
+        )
+        payload = json.dumps(
+            {
+                "sources": normalized,
+                "conversation_config": conversation_config,
+                "model": model_name,
+            },
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[DialogueScript]:
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                script = DialogueScript.model_validate_json(f.read())
+            os.utime(self._path(key))
+            return script
+        except (OSError, ValueError) as e:
+            print(f"[ScriptCache] Dropping unreadable entry {key[:12]}: {e}")
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+
+    def put(self, key: str, script: DialogueScript):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(script.model_dump_json())
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = None
+            evicted = []
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+
+        for old_key in evicted:
+            try:
+                os.remove(self._path(old_key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _load_index(self):
+        """디스크의 파일 mtime 순으로 LRU 순서 복원"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                files.append((os.path.getmtime(os.path.join(self.cache_dir, name)), name[:-5]))
+        for _, key in sorted(files):
+            self._entries[key] = None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+
+# Singleton instance
+script_cache = ScriptCache(
+    cache_dir=os.path.join(settings.DATA_DIR, "cache", "scripts"),
+    max_entries=settings.SCRIPT_CACHE_MAX_ENTRIES
+)
@@ -0,0 +1,128 @@
+"""
+Script Stream
+Gemini 응답을 스트리밍으로 받아 <Person1>/<Person2> 대사를 도착하는 대로 DialogueLine으로 변환
+"""
+import re
+from typing import AsyncIterator, Dict, List
+
+from src.config import settings
+from src.models import DialogueLine
+
+# 완결된 대사: 여는 태그부터 다음 여는 태그 또는 닫는 태그 직전까지
+_TURN_PATTERN = re.compile(r'<(Person\d)>(.*?)(?=<Person\d>|</Person\d>)', re.DOTALL)
+# 스트림 끝에 남은 마지막 대사
+_TAIL_PATTERN = re.compile(r'<(Person\d)>(.*)', re.DOTALL)
+_CLOSING_TAG = re.compile(r'\s*</Person\d>')
+_LANG_TAG = re.compile(r'<lang xml:lang="[^"]*">')
+
+
+def clean_turn_text(text: str) -> str:
+    """대사 본문에서 닫는 태그와 <lang> 태그 제거"""
+    text = re.sub(r'</Person\d>', '', text.strip()).strip()
+    return _LANG_TAG.sub('', text).strip()
+
+
+def title_from_lines(lines: List[DialogueLine]) -> str:
+    """첫 번째 대사의 키워드로 제목 추정"""
+    if lines and ("일일 팟캐스트" in lines[0].text or "팟캐스트" in lines[0].text):
+        return "일일 팟캐스트"
+    return "Untitled Podcast"
+
+
+class TranscriptStreamParser:
+    """
+    <PersonN> 형식 transcript의 증분 파서
+
+    feed()로 받은 텍스트를 버퍼에 쌓고, 다음 태그가 도착해 끝이 확정된 대사만 반환합니다.
+    스트림이 끝나면 close()로 마지막 대사를 꺼냅니다.
+    """
+
+    def __init__(self, speaker_map: Dict[str, str]):
+        self.speaker_map = speaker_map
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[DialogueLine]:
+        self._buffer += text
+        lines = []
+        while True:
+            match = _TURN_PATTERN.search(self._buffer)
+            if not match:
+                break
+            end = match.end()
+            closing = _CLOSING_TAG.match(self._buffer, end)
+            if closing:
+                end = closing.end()
+            self._buffer = self._buffer[end:]
+            self._append(lines, match.group(1), match.group(2))
+        return lines
+
+    def close(self) -> List[DialogueLine]:
+        lines = []
+        match = _TAIL_PATTERN.search(self._buffer)
+        if match:
+            self._append(lines, match.group(1), match.group(2))
+        self._buffer = ""
+        return lines
+
+    def _append(self, lines: List[DialogueLine], speaker_tag: str, text: str):
+        text = clean_turn_text(text)
+        if text:
+            lines.append(DialogueLine(
+                speaker=self.speaker_map.get(speaker_tag, speaker_tag),
+                text=text,
+                emotion=None
+            ))
+
+
+def build_script_prompt(source_texts: List[str], conversation_config: dict) -> str:
+    """conversation_config를 반영한 대본 생성 프롬프트"""
+    config = conversation_config
+    sources = "\n\n".join(
+        f"[Source {i + 1}]\n{text.strip()}" for i, text in enumerate(source_texts)
+    )
+    return (
+        f"Write a podcast conversation in {config['output_language']} based on the sources below.\n"
+        f"Podcast name: {config['podcast_name']} ({config['podcast_tagline']})\n"
+        f"Person1 is the {config['roles_person1']}; Person2 is the {config['roles_person2']}.\n"
+        f"Style: {', '.join(config['conversation_style'])}.\n"
+        f"Structure: {' -> '.join(config['dialogue_structure'])}.\n"
+        f"{' '.join(config['engagement_techniques'])}\n"
+        "Wrap every turn as <Person1>...</Person1> or <Person2>...</Person2> and output nothing else.\n"
+        f"End the episode with: {config['ending_message']}\n\n"
+        f"{sources}"
+    )
+
+
+async def stream_dialogue_lines(
+    source_texts: List[str],
+    conversation_config: dict,
+    speaker_map: Dict[str, str],
+    model_name: str
+) -> AsyncIterator[DialogueLine]:
+    """
+    Gemini 스트리밍 호출로 대본 생성
+
+    토큰이 도착하는 대로 파싱하여 완결된 대사부터 하나씩 반환하므로,
+    전체 대본이 끝나기 전에 TTS를 시작할 수 있습니다.
+    """
+    import google.generativeai as genai
+
+    genai.configure(api_key=settings.GEMINI_API_KEY)
+    model = genai.GenerativeModel(model_name)
+    parser = TranscriptStreamParser(speaker_map)
+
+    response = await model.generate_content_async(
+        build_script_prompt(source_texts, conversation_config),
+        stream=True
+    )
+    async for chunk in response:
+        try:
+            text = chunk.text
+        except ValueError:
+            # 텍스트 없는 청크 (finish_reason만 있는 경우 등)
+            continue
+        for line in parser.feed(text):
+            yield line
+
+    for line in parser.close():
+        yield line
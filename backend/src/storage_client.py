@@ -3,66 +3,293 @@ Supabase Storage Client
 오디오 파일을 Supabase Storage에 업로드하고 Public URL 반환
 """
 import os
-from typing import Optional
+import time
+import base64
+import asyncio
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import httpx
 from supabase import create_client, Client
 from src.config import settings
+from src.metrics import UPLOAD_SECONDS
+
+TUS_VERSION = "1.0.0"
+# 일시적인 오류로 보고 재시도하는 상태 코드 (409: resumable 업로드의 offset 불일치)
+RETRY_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, httpx.TransportError):
+        return True
+    return isinstance(error, httpx.HTTPStatusError) and error.response.status_code in RETRY_STATUS_CODES
 
 
 class StorageClient:
-    """Supabase Storage 래퍼"""
-    
+    """
+    Supabase Storage 래퍼
+
+    업로드는 Storage REST API를 공유 커넥션 풀(httpx.AsyncClient)로 직접 호출합니다.
+    - 큰 파일은 TUS resumable 업로드로 6MB 청크씩 전송하고, 실패 시 서버 offset부터 재개
+    - 일시적인 오류는 지수 백오프로 제한된 횟수만큼 재시도
+    - upload_in_background()로 응답을 막지 않고 업로드 가능
+    url/transport를 지정하면 로컬 대역 서버나 httpx.MockTransport로 테스트할 수 있습니다.
+    """
+
     BUCKET_NAME = "podcast-audio"
-    
-    def __init__(self):
+    # Supabase resumable 업로드는 6MB 청크만 허용
+    CHUNK_SIZE = 6 * 1024 * 1024
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        key: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.url = (settings.SUPABASE_URL if url is None else url).rstrip("/")
+        self.key = settings.SUPABASE_KEY if key is None else key
+        self.transport = transport
         self.client: Optional[Client] = None
-        if settings.SUPABASE_URL and settings.SUPABASE_KEY:
+        if self.url and self.key:
             try:
-                self.client = create_client(
-                    settings.SUPABASE_URL, 
-                    settings.SUPABASE_KEY
-                )
+                self.client = create_client(self.url, self.key)
             except Exception as e:
                 print(f"[WARNING] Failed to initialize Supabase client: {e}")
-    
+
+        # 이벤트 루프별 공유 HTTP 클라이언트
+        self._http_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+
     def is_enabled(self) -> bool:
         """Supabase 연동 활성화 여부"""
         return self.client is not None
-    
-    def upload_audio(self, local_path: str, remote_name: str) -> str:
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """현재 이벤트 루프의 공유 HTTP 클라이언트 (루프마다 하나)"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._http_clients.get(loop)
+            if client is None:
+                # 이미 닫힌 루프의 클라이언트는 더 이상 쓸 수 없으므로 목록에서 제거
+                self._http_clients = {l: c for l, c in self._http_clients.items() if not l.is_closed()}
+                client = self._http_clients[loop] = httpx.AsyncClient(
+                    timeout=httpx.Timeout(settings.STORAGE_UPLOAD_TIMEOUT_SECONDS),
+                    limits=httpx.Limits(max_connections=settings.STORAGE_MAX_CONNECTIONS),
+                    headers={"Authorization": f"Bearer {self.key}", "apikey": self.key},
+                    transport=self.transport
+                )
+        return client
+
+    async def aclose(self, timeout: float = 30.0):
+        """진행 중인 백그라운드 업로드를 기다린 뒤 현재 이벤트 루프의 HTTP 클라이언트 종료"""
+        pending = list(self._pending.values())
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+        with self._lock:
+            client = self._http_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def public_url(self, remote_name: str) -> str:
+        return f"{self.url}/storage/v1/object/public/{self.BUCKET_NAME}/{remote_name}"
+
+    async def upload_audio_async(self, local_path: str, remote_name: str) -> str:
         """
-        오디오 파일을 Supabase Storage에 업로드
-        
+        오디오 파일을 Supabase Storage에 업로드 (유일한 업로드 API)
+
+        STORAGE_RESUMABLE_THRESHOLD_MB보다 큰 파일은 resumable 업로드를 사용합니다.
+
         Args:
             local_path: 로컬 파일 경로
             remote_name: 저장할 파일명 (UUID.mp3 권장)
-        
+
         Returns:
             str: Public URL
         """
         if not self.client:
             raise RuntimeError("Supabase not configured")
-        
+
         if not os.path.exists(local_path):
-             raise FileNotFoundError(f"Audio file not found: {local_path}")
+            raise FileNotFoundError(f"Audio file not found: {local_path}")
 
+        size = os.path.getsize(local_path)
+        start = time.perf_counter()
+        method = "resumable" if size > settings.STORAGE_RESUMABLE_THRESHOLD_MB * 1024 * 1024 else "single"
         try:
-            with open(local_path, "rb") as f:
-                self.client.storage.from_(self.BUCKET_NAME).upload(
-                    path=remote_name,
-                    file=f,
-                    file_options={"content-type": "audio/mpeg"}
-                )
-            
-            return self.client.storage.from_(self.BUCKET_NAME).get_public_url(remote_name)
+            if method == "resumable":
+                await self._upload_resumable(local_path, remote_name, size)
+            else:
+                await self._upload_single(local_path, remote_name)
         except Exception as e:
             print(f"[ERROR] Failed to upload audio to Supabase: {e}")
             raise e
-    
+
+        elapsed = time.perf_counter() - start
+        UPLOAD_SECONDS.observe(elapsed, method=method)
+        print(f"[Storage] Uploaded {remote_name} ({size / 1024 / 1024:.1f} MB) in {elapsed:.2f}s")
+        return self.public_url(remote_name)
+
+    def upload_in_background(self, local_path: str, remote_name: str) -> asyncio.Task:
+        """
+        업로드를 백그라운드 태스크로 시작 (실행 중인 이벤트 루프에서 호출)
+
+        호출자는 로컬 경로를 바로 반환하고, 태스크 결과(Public URL, 실패 시 None)로 나중에 교체합니다.
+        로컬 파일은 업로드 후에도 남겨 두어 이미 반환된 로컬 URL이 계속 동작합니다.
+        """
+        task = asyncio.get_running_loop().create_task(self._background_upload(local_path, remote_name))
+        with self._lock:
+            self._pending[local_path] = task
+        return task
+
+    def pending_upload(self, local_path: str) -> Optional[asyncio.Task]:
+        """local_path의 진행 중인 백그라운드 업로드 태스크 (없으면 None)"""
+        with self._lock:
+            return self._pending.get(local_path)
+
+    async def _background_upload(self, local_path: str, remote_name: str) -> Optional[str]:
+        try:
+            return await self.upload_audio_async(local_path, remote_name)
+        except Exception as e:
+            print(f"[ERROR] Background upload failed, keeping local file: {e}")
+            return None
+        finally:
+            with self._lock:
+                self._pending.pop(local_path, None)
+
+    async def _upload_single(self, local_path: str, remote_name: str):
+        with open(local_path, "rb") as f:
+            data = await asyncio.to_thread(f.read)
+        await self._request(
+            "POST",
+            f"{self.url}/storage/v1/object/{self.BUCKET_NAME}/{remote_name}",
+            content=data,
+            # 재시도가 이미 저장된 객체와 충돌하지 않도록 덮어쓰기 허용
+            headers={"Content-Type": "audio/mpeg", "x-upsert": "true"}
+        )
+
+    async def _upload_resumable(self, local_path: str, remote_name: str, size: int):
+        """TUS 프로토콜로 청크 업로드. 청크 전송이 실패하면 서버의 Upload-Offset부터 재개"""
+        metadata = {
+            "bucketName": self.BUCKET_NAME,
+            "objectName": remote_name,
+            "contentType": "audio/mpeg",
+        }
+        response = await self._request(
+            "POST",
+            f"{self.url}/storage/v1/upload/resumable",
+            headers={
+                "Tus-Resumable": TUS_VERSION,
+                "Upload-Length": str(size),
+                "Upload-Metadata": ",".join(
+                    f"{k} {base64.b64encode(v.encode()).decode()}" for k, v in metadata.items()
+                ),
+                "x-upsert": "true",
+            }
+        )
+        location = urljoin(f"{self.url}/", response.headers["location"])
+
+        offset = 0
+        failures = 0
+        with open(local_path, "rb") as f:
+            while offset < size:
+                f.seek(offset)
+                chunk = await asyncio.to_thread(f.read, self.CHUNK_SIZE)
+                try:
+                    response = await self._request(
+                        "PATCH",
+                        location,
+                        content=chunk,
+                        headers={
+                            "Tus-Resumable": TUS_VERSION,
+                            "Upload-Offset": str(offset),
+                            "Content-Type": "application/offset+octet-stream",
+                        },
+                        retries=0
+                    )
+                except httpx.HTTPError as e:
+                    if not _is_retryable(e) or failures >= settings.STORAGE_UPLOAD_RETRIES:
+                        raise
+                    await self._backoff(failures, f"chunk at {offset}", e)
+                    failures += 1
+                    # 서버가 실제로 받은 위치부터 이어서 전송
+                    head = await self._request("HEAD", location, headers={"Tus-Resumable": TUS_VERSION})
+                    offset = int(head.headers["upload-offset"])
+                    continue
+                failures = 0
+                offset = int(response.headers.get("upload-offset", offset + len(chunk)))
+
+    async def _request(self, method: str, url: str, retries: Optional[int] = None, **kwargs) -> httpx.Response:
+        """일시적인 오류는 지수 백오프로 재시도하는 요청"""
+        if retries is None:
+            retries = settings.STORAGE_UPLOAD_RETRIES
+        attempt = 0
+        while True:
+            try:
+                response = await self.http.request(method, url, **kwargs)
+                response.raise_for_status()
+                return response
+            except httpx.HTTPError as e:
+                if not _is_retryable(e) or attempt >= retries:
+                    raise
+                await self._backoff(attempt, method, e)
+                attempt += 1
+
+    @staticmethod
+    async def _backoff(attempt: int, what: str, error: Exception):
+        delay = settings.STORAGE_UPLOAD_BACKOFF_SECONDS * 2 ** attempt
+        print(f"[Storage] {what} failed ({error}), retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+    def list_audio(self, page_size: int = 1000) -> List[dict]:
+        """버킷의 모든 객체 (name, created_at, metadata.size 포함)를 페이지 단위로 조회"""
+        if not self.client:
+            return []
+
+        bucket = self.client.storage.from_(self.BUCKET_NAME)
+        objects = []
+        offset = 0
+        while True:
+            page = bucket.list(options={
+                "limit": page_size,
+                "offset": offset,
+                "sortBy": {"column": "created_at", "order": "asc"},
+            })
+            objects.extend(obj for obj in page if obj.get("id"))  # id가 없으면 폴더
+            if len(page) < page_size:
+                return objects
+            offset += page_size
+
+    def delete_audio_batch(self, remote_names: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        여러 파일을 STORAGE_DELETE_BATCH_SIZE개씩 묶어 remove([...]) 한 번으로 삭제
+
+        Returns:
+            tuple: (삭제된 파일명, 요청이 실패한 파일명). 버킷에 없던 파일은 어느 쪽에도 포함되지 않습니다.
+        """
+        if not self.client:
+            return [], []
+
+        bucket = self.client.storage.from_(self.BUCKET_NAME)
+        batch_size = settings.STORAGE_DELETE_BATCH_SIZE
+        removed, failed = [], []
+        for start in range(0, len(remote_names), batch_size):
+            batch = remote_names[start:start + batch_size]
+            try:
+                result = bucket.remove(batch)
+                removed.extend(obj["name"] for obj in result or [])
+            except Exception as e:
+                print(f"[ERROR] Failed to delete {len(batch)} files from Supabase: {e}")
+                failed.extend(batch)
+        return removed, failed
+
     def delete_audio(self, remote_name: str) -> bool:
         """오디오 파일 삭제"""
         if not self.client:
             return False
-        
+
         try:
             self.client.storage.from_(self.BUCKET_NAME).remove([remote_name])
             return True
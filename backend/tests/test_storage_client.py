@@ -0,0 +1,204 @@
+"""
+StorageClient against a local stand-in for the Supabase Storage API:
+uploads go through httpx.MockTransport, list/remove through a fake
+supabase client.
+"""
+import base64
+import asyncio
+from typing import Dict, List
+
+import httpx
+import pytest
+
+from src.config import settings
+from src.storage_client import StorageClient
+
+URL = "http://storage.test"
+
+
+class FakeStorageServer:
+    """Storage REST API: single-request uploads and TUS resumable uploads."""
+
+    def __init__(self, fail_patches: int = 0):
+        self.objects: Dict[str, bytes] = {}
+        self.requests: List[httpx.Request] = []
+        self.fail_patches = fail_patches
+        self._uploads: Dict[str, dict] = {}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        if request.method == "POST" and path.startswith("/storage/v1/object/podcast-audio/"):
+            self.objects[path.rsplit("/", 1)[1]] = request.content
+            return httpx.Response(200, json={"Key": path})
+        if request.method == "POST" and path == "/storage/v1/upload/resumable":
+            upload_id = f"upload-{len(self._uploads)}"
+            self._uploads[upload_id] = {
+                "name": self._object_name(request),
+                "length": int(request.headers["upload-length"]),
+                "data": b"",
+            }
+            return httpx.Response(201, headers={"Location": f"/storage/v1/upload/resumable/{upload_id}"})
+
+        upload = self._uploads[path.rsplit("/", 1)[1]]
+        if request.method == "HEAD":
+            return httpx.Response(200, headers={"Upload-Offset": str(len(upload["data"]))})
+        if request.method == "PATCH":
+            if int(request.headers["upload-offset"]) != len(upload["data"]):
+                return httpx.Response(409)
+            if self.fail_patches:
+                # Half the chunk arrives before the connection drops
+                self.fail_patches -= 1
+                upload["data"] += request.content[:len(request.content) // 2]
+                return httpx.Response(503)
+            upload["data"] += request.content
+            if len(upload["data"]) == upload["length"]:
+                self.objects[upload["name"]] = upload["data"]
+            return httpx.Response(204, headers={"Upload-Offset": str(len(upload["data"]))})
+        return httpx.Response(404)
+
+    @staticmethod
+    def _object_name(request: httpx.Request) -> str:
+        for item in request.headers["upload-metadata"].split(","):
+            key, value = item.split(" ")
+            if key == "objectName":
+                return base64.b64decode(value).decode()
+        raise AssertionError("upload without objectName")
+
+
+class FakeBucket:
+    def __init__(self, objects: Dict[str, dict], fail_names=()):
+        self.objects = objects
+        self.fail_names = set(fail_names)
+        self.remove_calls: List[List[str]] = []
+
+    def list(self, options: dict) -> List[dict]:
+        rows = sorted(self.objects.values(), key=lambda o: o["created_at"])
+        # Supabase lists folders as rows without an id
+        rows = [{"name": "folder", "id": None}] + rows
+        return rows[options["offset"]:options["offset"] + options["limit"]]
+
+    def remove(self, names: List[str]) -> List[dict]:
+        self.remove_calls.append(list(names))
+        if self.fail_names & set(names):
+            raise RuntimeError("remove failed")
+        return [{"name": self.objects.pop(n)["name"]} for n in names if n in self.objects]
+
+
+class FakeSupabase:
+    def __init__(self, bucket: FakeBucket):
+        self.bucket = bucket
+        self.storage = self
+
+    def from_(self, name: str) -> FakeBucket:
+        assert name == StorageClient.BUCKET_NAME
+        return self.bucket
+
+
+def make_client(server=None, bucket=None) -> StorageClient:
+    # No key, so no real Supabase client is created
+    client = StorageClient(url=URL, key="", transport=httpx.MockTransport(server or FakeStorageServer()))
+    client.key = "test-key"
+    client.client = FakeSupabase(bucket or FakeBucket({}))
+    return client
+
+
+def upload(client: StorageClient, path, name: str) -> str:
+    async def run():
+        try:
+            return await client.upload_audio_async(str(path), name)
+        finally:
+            await client.aclose()
+    return asyncio.run(run())
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "STORAGE_UPLOAD_BACKOFF_SECONDS", 0.0)
+    monkeypatch.setattr(settings, "STORAGE_UPLOAD_RETRIES", 2)
+
+
+def test_upload_single(tmp_path):
+    path = tmp_path / "episode.mp3"
+    path.write_bytes(b"mp3" * 100)
+    server = FakeStorageServer()
+
+    url = upload(make_client(server), path, "episode.mp3")
+
+    assert url == f"{URL}/storage/v1/object/public/podcast-audio/episode.mp3"
+    assert server.objects["episode.mp3"] == b"mp3" * 100
+    assert server.requests[0].headers["authorization"] == "Bearer test-key"
+
+
+def test_upload_resumable_resumes_from_server_offset(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "STORAGE_RESUMABLE_THRESHOLD_MB", 0)
+    data = bytes(range(256)) * 40
+    path = tmp_path / "long.mp3"
+    path.write_bytes(data)
+    server = FakeStorageServer(fail_patches=1)
+    client = make_client(server)
+    client.CHUNK_SIZE = 4096
+
+    upload(client, path, "long.mp3")
+
+    assert server.objects["long.mp3"] == data
+    methods = [r.method for r in server.requests]
+    assert methods.count("HEAD") == 1
+    # The chunk after the failure starts where the server stopped
+    patches = [r for r in server.requests if r.method == "PATCH"]
+    assert patches[1].headers["upload-offset"] == str(4096 // 2)
+
+
+def test_upload_gives_up_after_retries(tmp_path):
+    path = tmp_path / "episode.mp3"
+    path.write_bytes(b"x")
+    attempts = []
+
+    def unavailable(request):
+        attempts.append(request)
+        return httpx.Response(503)
+
+    client = StorageClient(url=URL, key="", transport=httpx.MockTransport(unavailable))
+    client.client = FakeSupabase(FakeBucket({}))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        upload(client, path, "episode.mp3")
+    assert len(attempts) == settings.STORAGE_UPLOAD_RETRIES + 1
+
+
+def test_upload_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        upload(make_client(), tmp_path / "missing.mp3", "missing.mp3")
+
+
+def test_list_audio_pages_and_skips_folders():
+    objects = {
+        f"{i}.mp3": {"name": f"{i}.mp3", "id": str(i), "created_at": f"2026-01-{i + 1:02d}T00:00:00Z"}
+        for i in range(5)
+    }
+    client = make_client(bucket=FakeBucket(objects))
+
+    listed = client.list_audio(page_size=2)
+
+    assert [o["name"] for o in listed] == [f"{i}.mp3" for i in range(5)]
+
+
+def test_delete_audio_batch(monkeypatch):
+    monkeypatch.setattr(settings, "STORAGE_DELETE_BATCH_SIZE", 2)
+    objects = {n: {"name": n} for n in ("a.mp3", "b.mp3", "c.mp3", "e.mp3", "f.mp3")}
+    bucket = FakeBucket(objects, fail_names={"e.mp3"})
+    client = make_client(bucket=bucket)
+
+    removed, failed = client.delete_audio_batch(["a.mp3", "b.mp3", "c.mp3", "missing.mp3", "e.mp3", "f.mp3"])
+
+    assert bucket.remove_calls == [["a.mp3", "b.mp3"], ["c.mp3", "missing.mp3"], ["e.mp3", "f.mp3"]]
+    assert removed == ["a.mp3", "b.mp3", "c.mp3"]
+    assert failed == ["e.mp3", "f.mp3"]
+
+
+def test_disabled_client():
+    client = StorageClient(url="", key="")
+
+    assert not client.is_enabled()
+    assert client.list_audio() == []
+    assert client.delete_audio_batch(["a.mp3"]) == ([], [])